@@ -11,8 +11,11 @@ Parameters
 Return
 ------
 """
+__version__ = "1.0.0"
+
 from rates.isotope import Isotope
 from rates.reaction import Reaction, ReaclibReaction, KadonisReaction
 from rates.kadonis_file import Kadonis
 from rates.reaclib_file import Reaclib
+from rates.ppn_macs_file import PPNMacs
 from rates.temperature import Temperature
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Binary cache of the columnar arrays read from rate files.
+
+A cache file is a small JSON header followed by the raw bytes of every
+array, each aligned to 64 bytes so it can be memory mapped straight back.
+The arrays are mapped copy on write, so they can be edited like freshly
+parsed ones without the edits reaching the cache file.
+The header stores the key the cache was built for (source content hash,
+source size, reader and library version) and the cache is rebuilt whenever
+any of them no longer matches.
+"""
+
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Callable, Dict, Union
+
+import numpy as np
+
+import rates
+
+CACHE_VERSION = 3
+MAGIC = b"RATESNPC"
+ALIGNMENT = 64
+
+Columns = Dict[str, np.ndarray]
+
+
+def cache_path(file_path: Union[str, Path]) -> Path:
+    """Path of the cache belonging to a source file.
+
+    Parameters
+    ----------
+    file_path : Union[str, Path]
+        Path to the source file.
+
+    Returns
+    -------
+    Path
+    """
+    file_path = Path(file_path)
+    return file_path.parent / "{0}.cache".format(file_path.stem)
+
+
+def source_key(file_path: Union[str, Path], reader: str) -> Dict[str, object]:
+    """Key identifying the content of a source file and the code that read it.
+
+    Parameters
+    ----------
+    file_path : Union[str, Path]
+        Path to the source file.
+    reader : str
+        Name of the reader, different readers of the same file do not share a
+        cache.
+
+    Returns
+    -------
+    Dict[str, object]
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            sha256.update(block)
+
+    return {
+        "sha256": sha256.hexdigest(),
+        "size": os.path.getsize(file_path),
+        "reader": reader,
+        "version": rates.__version__,
+        "cache_version": CACHE_VERSION,
+    }
+
+
+def write(path: Union[str, Path], key: Dict[str, object], columns: Columns) -> None:
+    """Writes columns to a cache file, replacing it atomically.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+    key : Dict[str, object]
+        Output of source_key.
+    columns : Dict[str, np.ndarray]
+        Arrays to store, object arrays are not supported.
+    """
+    path = Path(path)
+    arrays = {
+        name: np.ascontiguousarray(array).reshape(np.shape(array))
+        for name, array in columns.items()
+    }
+
+    layout = []
+    offset = 0
+    for name, array in arrays.items():
+        if array.dtype.hasobject:
+            raise ValueError("Object arrays can not be cached", name)
+        layout.append(
+            {
+                "name": name,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+        )
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = json.dumps({"key": key, "arrays": layout}).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as cache:
+        cache.write(MAGIC)
+        cache.write(struct.pack("<Q", len(header)))
+        cache.write(header)
+        for entry, array in zip(layout, arrays.values()):
+            cache.seek(data_start + entry["offset"])
+            cache.write(array.tobytes())
+        cache.truncate(data_start + offset)
+    os.replace(temp_path, path)
+
+
+def read(path: Union[str, Path], key: Dict[str, object]) -> Union[Columns, None]:
+    """Memory maps the columns of a cache file.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+    key : Dict[str, object]
+        Key the cache must have been written with.
+
+    Returns
+    -------
+    [Dict[str, np.ndarray], None]
+        Read only arrays, None if the cache is missing, stale or unreadable.
+    """
+    try:
+        with open(path, "rb") as cache:
+            if cache.read(len(MAGIC)) != MAGIC:
+                return None
+            (header_length,) = struct.unpack("<Q", cache.read(8))
+            header = json.loads(cache.read(header_length).decode())
+    except (OSError, struct.error, UnicodeDecodeError, ValueError):
+        return None
+
+    if header.get("key") != key:
+        return None
+
+    data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+    columns = {}
+    try:
+        for entry in header["arrays"]:
+            dtype = np.dtype(entry["dtype"])
+            shape = tuple(entry["shape"])
+            if dtype.itemsize * int(np.prod(shape)) == 0:
+                columns[entry["name"]] = np.empty(shape, dtype=dtype)
+                continue
+            columns[entry["name"]] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="c",
+                offset=data_start + entry["offset"],
+                shape=shape or (1,),
+            ).reshape(shape)
+    except (KeyError, TypeError, ValueError, OSError):
+        return None
+
+    return columns
+
+
+def load(
+    file_path: Union[str, Path], reader: Callable[[Path], Columns], name: str
+) -> Columns:
+    """Columns of a source file, from its cache when that is up to date.
+
+    Parameters
+    ----------
+    file_path : Union[str, Path]
+        Path to the source file.
+    reader : Callable[[Path], Dict[str, np.ndarray]]
+        Parses the source file into columns when the cache is stale.
+    name : str
+        Name of the reader, part of the cache key.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+    """
+    file_path = Path(file_path)
+    key = source_key(file_path, name)
+    path = cache_path(file_path)
+
+    columns = read(path, key)
+    if columns is None:
+        columns = reader(file_path)
+        try:
+            write(path, key, columns)
+        except OSError:
+            # Read only locations still work, just without a cache.
+            pass
+    return columns
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Implicit integration of the abundances of a Reaclib reaction network."""
+
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+from scipy.special import gammaln
+
+from rates.isotope import Isotope
+from rates.network import ReactionGraph
+from rates.nuclides import nuclide_table
+from rates.reaclib_file import Reaclib
+
+History = Union[float, Callable[[float], float], Tuple[np.ndarray, np.ndarray]]
+
+
+class NetworkIntegrator:
+    """Backward Euler integration of dY/dt for every nuclide of a Reaclib.
+
+    The flux of set s is
+
+        r_s = rate_s(T9) * density**(n_s - 1) * prod_j Y_j**c_j / prod_j c_j!
+
+    with n_s targets, c_j of them nuclide j, and dY/dt = stoichiometry @ r.
+    The Jacobian is the stoichiometry times the sparse (N, K) derivatives of
+    the fluxes, so both only touch the non zero entries, and every Newton
+    iteration is one sparse LU solve.
+
+    Parameters
+    ----------
+    network : [Reaclib, ReactionGraph]
+
+    Attributes
+    ----------
+    graph : ReactionGraph
+    reaclib : Reaclib
+    mass_number : np.ndarray
+        (K,) mass number of every node.
+
+    """
+
+    def __init__(self, network: Union[Reaclib, ReactionGraph]) -> None:
+        self.graph = (
+            network if isinstance(network, ReactionGraph) else ReactionGraph(network)
+        )
+        self.reaclib = self.graph.reaclib
+        self.mass_number = nuclide_table.mass_number[self.graph.nuclides].astype(
+            np.float64
+        )
+
+        targets = self.graph.target_nodes
+        self._slots = targets >= 0
+        self._targets = np.where(self._slots, targets, 0)
+        self._density_power = self._slots.sum(axis=1) - 1
+
+        log_factorial = self.graph.targets.astype(np.float64)
+        log_factorial.data = gammaln(log_factorial.data + 1)
+        self._inverse_factorial = np.exp(-np.asarray(log_factorial.sum(axis=0)))[0]
+
+        self._build_pattern()
+
+    def __len__(self) -> int:
+        return len(self.graph)
+
+    def _build_pattern(self) -> None:
+        """Sparsity of I - dt * J and how the flux derivatives fill it.
+
+        Every target slot of set s contributes stoichiometry[i, s] times its
+        flux derivative to J[i, target] for all nuclides i changed by s, the
+        (entries, slots) matrix doing this is built once so that a Newton
+        iteration only needs one sparse product to fill the Jacobian.
+        """
+        stoichiometry = self.graph.stoichiometry.tocsc()
+        sets = np.broadcast_to(
+            np.arange(len(self._targets))[:, None], self._targets.shape
+        )[self._slots]
+        columns = self._targets[self._slots]
+
+        counts = np.diff(stoichiometry.indptr)[sets]
+        slot = np.repeat(np.arange(len(sets)), counts)
+        start = np.repeat(stoichiometry.indptr[sets], counts)
+        entry = (
+            start + np.arange(len(slot)) - np.repeat(np.cumsum(counts) - counts, counts)
+        )
+        rows = stoichiometry.indices[entry]
+        columns = columns[slot]
+
+        # Column major order with the diagonal always present, as splu wants.
+        diagonal = np.arange(len(self))
+        flat, position = np.unique(
+            np.concatenate((columns, diagonal)) * len(self)
+            + np.concatenate((rows, diagonal)),
+            return_inverse=True,
+        )
+        position = position.ravel()
+        self._pattern_indices = flat % len(self)
+        self._pattern_indptr = np.searchsorted(
+            flat // len(self), np.arange(len(self) + 1)
+        )
+        is_diagonal = np.zeros(len(flat))
+        is_diagonal[position[len(rows) :]] = 1.0
+
+        # The structure never changes, so a fill reducing ordering is found
+        # once (from a diagonally dominant matrix of that structure) and the
+        # pattern is stored permuted, every factorization then skips it.
+        ordering = splu(
+            self._pattern(is_diagonal * len(flat) + 1.0), permc_spec="MMD_AT_PLUS_A"
+        ).perm_c
+        self._order = np.empty_like(ordering)
+        self._order[ordering] = np.arange(len(ordering))
+        self._rank = ordering
+        permuted = self._pattern(np.arange(1.0, len(flat) + 1))[self._order][
+            :, self._order
+        ].tocsc()
+        permuted.sort_indices()
+        source = permuted.data.astype(np.int64) - 1
+        self._pattern_indices = permuted.indices
+        self._pattern_indptr = permuted.indptr
+        self._pattern_diagonal = is_diagonal[source]
+
+        fill = sparse.csr_matrix(
+            (stoichiometry.data[entry], (position[: len(rows)], slot)),
+            shape=(len(flat), len(sets)),
+        )
+        self._pattern_fill = fill[source]
+
+    def abundances(self, abundances: Dict[Union[Isotope, str], float]) -> np.ndarray:
+        """(K,) abundance vector from {isotope: Y}, zero for the rest.
+
+        Parameters
+        ----------
+        abundances : Dict[Union[Isotope, str], float]
+
+        Returns
+        -------
+        np.ndarray
+        """
+        nodes = self.graph.node(list(abundances))
+        if np.any(nodes < 0):
+            raise Exception("Isotope not in the network")
+        y = np.zeros(len(self))
+        y[nodes] = list(abundances.values())
+        return y
+
+    def mass_fractions(self, y: np.ndarray) -> np.ndarray:
+        """Mass fractions X = A * Y of abundances of shape (..., K)."""
+        return np.asarray(y) * self.mass_number
+
+    def coefficients(self, temp9: float, density: float) -> np.ndarray:
+        """(N,) rate of every set including its density and factorial terms.
+
+        Parameters
+        ----------
+        temp9 : float
+        density : float
+            g/cm^3
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return (
+            self.reaclib.rates(temp9)
+            * float(density) ** self._density_power
+            * self._inverse_factorial
+        )
+
+    def rhs(self, y: np.ndarray, coefficients: np.ndarray) -> np.ndarray:
+        """dY/dt of abundances y.
+
+        Parameters
+        ----------
+        y : np.ndarray
+            (K,) abundances.
+        coefficients : np.ndarray
+            (N,) from coefficients.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        y_targets = np.where(self._slots, y[self._targets], 1.0)
+        return self.graph.stoichiometry @ (coefficients * y_targets.prod(axis=1))
+
+    def jacobian(self, y: np.ndarray, coefficients: np.ndarray) -> sparse.csc_matrix:
+        """(K, K) sparse d(dY/dt)/dY of abundances y.
+
+        Parameters
+        ----------
+        y : np.ndarray
+            (K,) abundances.
+        coefficients : np.ndarray
+            (N,) from coefficients.
+
+        Returns
+        -------
+        sparse.csc_matrix
+        """
+        jacobian = self._pattern(self._fill(y, coefficients))
+        return jacobian[self._rank][:, self._rank].tocsc()
+
+    def _fill(self, y: np.ndarray, coefficients: np.ndarray) -> np.ndarray:
+        """Jacobian entries in the order of the precomputed pattern."""
+        y_targets = np.where(self._slots, y[self._targets], 1.0)
+        # Product of the other targets of every slot, without dividing by Y.
+        before = np.cumprod(
+            np.column_stack((np.ones(len(y_targets)), y_targets[:, :-1])), axis=1
+        )
+        after = np.cumprod(
+            np.column_stack((np.ones(len(y_targets)), y_targets[:, :0:-1])), axis=1
+        )[:, ::-1]
+        derivatives = (coefficients[:, None] * before * after)[self._slots]
+        return self._pattern_fill @ derivatives
+
+    def _pattern(self, data: np.ndarray) -> sparse.csc_matrix:
+        """Matrix of the (permuted) Jacobian structure holding data."""
+        return sparse.csc_matrix(
+            (data, self._pattern_indices, self._pattern_indptr),
+            shape=(len(self), len(self)),
+        )
+
+    def integrate(
+        self,
+        y0: Union[np.ndarray, Dict[Union[Isotope, str], float]],
+        time: float,
+        temp9: History,
+        density: History,
+        output_times: Sequence[float] = None,
+        dt: float = None,
+        max_change: float = 0.05,
+        y_min: float = 1e-12,
+        tolerance: float = 1e-10,
+        max_iterations: int = 10,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Integrates the abundances from time 0 to time.
+
+        Parameters
+        ----------
+        y0 : [np.ndarray, Dict[Union[Isotope, str], float]]
+            (K,) initial abundances or {isotope: Y}.
+        time : float
+            s
+        temp9 : [float, Callable[[float], float], Tuple[np.ndarray, np.ndarray]]
+            Constant T9, T9 as a function of time or (times, T9) to interpolate.
+        density : [float, Callable[[float], float], Tuple[np.ndarray, np.ndarray]]
+            Constant density, density as a function of time or (times, density)
+            to interpolate, g/cm^3.
+        output_times : Sequence[float]
+            Only return the abundances at these times, every step is returned
+            if None.
+        dt : float
+            First step, time * 1e-8 if None.
+        max_change : float
+            Target relative change of the abundances above y_min per step.
+        y_min : float
+            Abundances below this do not limit the step.
+        tolerance : float
+            Relative convergence of the Newton iterations.
+        max_iterations : int
+            Newton iterations before the step is halved.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            (T,) times and (T, K) abundances, the initial ones included.
+        """
+        temp9 = _history(temp9)
+        density = _history(density)
+        y = np.array(
+            self.abundances(y0) if isinstance(y0, dict) else y0, dtype=np.float64
+        )
+        stops = np.unique(
+            np.append(output_times if output_times is not None else [], time)
+        )
+        stops = stops[(stops > 0) & (stops <= time)]
+        dt = time * 1e-8 if dt is None else dt
+
+        t = 0.0
+        times = [t]
+        history = [y.copy()]
+        for stop in stops:
+            while t < stop:
+                step = min(dt, stop - t)
+                coefficients = self.coefficients(temp9(t + step), density(t + step))
+                y_new, converged = self._newton(
+                    y, step, coefficients, y_min, tolerance, max_iterations
+                )
+                if not converged:
+                    dt = step / 2
+                    if dt < time * 1e-20:
+                        raise Exception("Network integration failed at t = " + str(t))
+                    continue
+
+                change = np.max(
+                    np.abs(y_new - y) / np.maximum(np.abs(y_new), y_min), initial=0.0
+                )
+                t = stop if step == stop - t else t + step
+                y = y_new
+                dt = (
+                    step * min(2.0, max(0.2, 0.9 * max_change / change))
+                    if change
+                    else 2 * step
+                )
+                if output_times is None:
+                    times.append(t)
+                    history.append(y.copy())
+            if output_times is not None:
+                times.append(t)
+                history.append(y.copy())
+        return np.array(times), np.array(history)
+
+    def _newton(
+        self,
+        y: np.ndarray,
+        dt: float,
+        coefficients: np.ndarray,
+        y_min: float,
+        tolerance: float,
+        max_iterations: int,
+    ) -> Tuple[np.ndarray, bool]:
+        """Solves y_new - y - dt * rhs(y_new) = 0.
+
+        The Jacobian is factorized once per step and reused by every
+        iteration (simplified Newton), a step that does not converge is
+        retried with a smaller dt anyway.
+        """
+        y_new = y.copy()
+        matrix = self._pattern(
+            self._pattern_diagonal - dt * self._fill(y_new, coefficients)
+        )
+        lu = splu(
+            matrix, permc_spec="NATURAL", diag_pivot_thresh=0.1, relax=1, panel_size=1
+        )
+        delta = np.empty_like(y)
+        for _ in range(max_iterations):
+            residual = y_new - y - dt * self.rhs(y_new, coefficients)
+            delta[self._order] = lu.solve(-residual[self._order])
+            y_new += delta
+            if not np.all(np.isfinite(y_new)):
+                return y, False
+            if np.all(np.abs(delta) <= tolerance * np.maximum(np.abs(y_new), y_min)):
+                if np.any(y_new < -y_min):
+                    return y, False
+                return np.maximum(y_new, 0.0), True
+        return y, False
+
+
+def _history(value: History) -> Callable[[float], float]:
+    """Function of time from a constant, a function or tabulated values."""
+    if callable(value):
+        return value
+    if isinstance(value, tuple):
+        times, values = (np.asarray(v, dtype=np.float64) for v in value)
+        return lambda t: float(np.interp(t, times, values))
+    return lambda t: float(value)
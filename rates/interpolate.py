@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Interpolation of tabulated rates in log-log space."""
+
+from typing import Union
+
+import numpy as np
+
+SCHEMES = ("linear", "cubic")
+
+
+class LogLogInterpolator:
+    """Interpolates rows of tabulated values in log-log space.
+
+    Everything that depends only on the table (logs, secants and, for the
+    monotone cubic scheme, the node derivatives) is computed once, evaluation
+    then only gathers the segment of every query point for all rows at once.
+    Values at the nodes are returned exactly, segments touching a missing
+    (NaN) value evaluate to NaN.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        (K,) increasing positive abscissae, e.g. kT.
+    y : np.ndarray
+        (K,) or (N, K) positive values, one row per table.
+    scheme : str {"linear", "cubic"}
+        Straight lines or monotone piecewise cubic Hermite (PCHIP) in log-log
+        space.
+    extrapolate : bool
+        Continue the end segments outside of x, else return NaN there.
+    log_y : bool
+        Interpolate log(y), else y itself against log(x), which suits
+        quantities that may be zero such as relative errors.
+
+    Attributes
+    ----------
+    log
+    __call__
+    """
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        scheme: str = "linear",
+        extrapolate: bool = False,
+        log_y: bool = True,
+    ) -> None:
+        if scheme not in SCHEMES:
+            raise Exception(scheme + " is not a supported interpolation scheme")
+
+        self.scheme = scheme
+        self.extrapolate = extrapolate
+        self.log_y = log_y
+        self.y = np.asarray(y, dtype=np.float64)
+        self.log_x = np.log(np.asarray(x, dtype=np.float64))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.values = np.log(self.y) if log_y else self.y
+            # Segment quantities are padded with a zero length last segment
+            # so that the last node itself needs no special case.
+            self.h = np.append(np.diff(self.log_x), 1.0)
+            self.dy = np.concatenate(
+                (np.diff(self.values), np.zeros(self.y.shape[:-1] + (1,))), axis=-1
+            )
+            if scheme == "cubic":
+                self.d = self._pchip_derivatives()
+
+    def _pchip_derivatives(self) -> np.ndarray:
+        """Fritsch-Carlson derivatives of the monotone cubic at every node."""
+        h = self.h[:-1]
+        secant = self.dy[..., :-1] / h
+        d = np.zeros(self.y.shape[:-1] + (len(self.log_x) + 1,))
+
+        w1 = 2 * h[1:] + h[:-1]
+        w2 = h[1:] + 2 * h[:-1]
+        same_sign = secant[..., :-1] * secant[..., 1:] > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            harmonic = (w1 + w2) / (w1 / secant[..., :-1] + w2 / secant[..., 1:])
+        d[..., 1:-2] = np.where(same_sign, harmonic, 0.0)
+
+        d[..., 0] = self._end_derivative(h[0], h[1], secant[..., 0], secant[..., 1])
+        d[..., -2] = self._end_derivative(
+            h[-1], h[-2], secant[..., -1], secant[..., -2]
+        )
+        # Nodes next to a missing or zero value get a flat derivative, the
+        # segments touching that value are already NaN through dy.
+        d[~np.isfinite(d)] = 0.0
+        return d
+
+    @staticmethod
+    def _end_derivative(
+        h0: float, h1: float, secant0: np.ndarray, secant1: np.ndarray
+    ) -> np.ndarray:
+        d = ((2 * h0 + h1) * secant0 - h0 * secant1) / (h0 + h1)
+        d = np.where(np.sign(d) != np.sign(secant0), 0.0, d)
+        return np.where(
+            (np.sign(secant0) != np.sign(secant1)) & (np.abs(d) > 3 * np.abs(secant0)),
+            3 * secant0,
+            d,
+        )
+
+    def _segments(self, x: np.ndarray):
+        log_x = np.log(np.asarray(x, dtype=np.float64))
+        last = len(self.log_x) - 1
+        i = np.clip(np.searchsorted(self.log_x, log_x, side="right") - 1, 0, last)
+        outside = (log_x < self.log_x[0]) | (log_x > self.log_x[-1])
+        if self.extrapolate:
+            i = np.where(log_x > self.log_x[-1], last - 1, i)
+        t = (log_x - self.log_x[i]) / self.h[i]
+        return i, t, outside
+
+    def _delta(self, i: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """Change of the interpolated values from node i to the query points."""
+        if self.scheme == "linear":
+            delta = t * self.dy[..., i]
+        else:
+            t2 = t * t
+            t3 = t2 * t
+            delta = (
+                (3 * t2 - 2 * t3) * self.dy[..., i]
+                + self.h[i] * (t3 - 2 * t2 + t) * self.d[..., i]
+                + self.h[i] * (t3 - t2) * self.d[..., i + 1]
+            )
+        return np.where(t == 0, 0.0, delta)
+
+    def log(self, x: Union[float, np.ndarray]) -> np.ndarray:
+        """Natural log of the interpolated values.
+
+        Parameters
+        ----------
+        x : [float, np.ndarray]
+            (M,) query points in the units of the table.
+
+        Returns
+        -------
+        np.ndarray
+            Shape of y without its last axis + shape of x.
+        """
+        if not self.log_y:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.log(self(x))
+
+        i, t, outside = self._segments(x)
+        with np.errstate(invalid="ignore"):
+            log_y = self.values[..., i] + self._delta(i, t)
+        if not self.extrapolate:
+            log_y = np.where(outside, np.nan, log_y)
+        return log_y
+
+    def __call__(self, x: Union[float, np.ndarray]) -> np.ndarray:
+        """Interpolated values.
+
+        Parameters
+        ----------
+        x : [float, np.ndarray]
+            (M,) query points in the units of the table.
+
+        Returns
+        -------
+        np.ndarray
+            Shape of y without its last axis + shape of x.
+        """
+        i, t, outside = self._segments(x)
+        with np.errstate(invalid="ignore", over="ignore"):
+            if self.log_y:
+                y = self.y[..., i] * np.exp(self._delta(i, t))
+            else:
+                y = self.y[..., i] + self._delta(i, t)
+        if not self.extrapolate:
+            y = np.where(outside, np.nan, y)
+        return y
+
+
+def relative_error(value: np.ndarray, error: np.ndarray) -> np.ndarray:
+    """error / value, zero wherever the error is zero.
+
+    Parameters
+    ----------
+    value : np.ndarray
+    error : np.ndarray
+        Absolute error of value.
+
+    Returns
+    -------
+    np.ndarray
+    """
+    value = np.asarray(value, dtype=np.float64)
+    error = np.asarray(error, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(error == 0, 0.0, error / value)
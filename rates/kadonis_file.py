@@ -16,10 +16,20 @@ import numpy as np
 import pandas as pd
 
 from pathlib import Path
-from typing import Union
+from typing import Union, Dict, Any, Iterator, Sequence, Tuple
 
+from rates import cache
+from rates.interpolate import LogLogInterpolator, relative_error
 from rates.isotope import Isotope
-from rates.reaction import KadonisReaction
+from rates.lazy import ReactionCache, ReactionFrame
+from rates.nuclides import nuclide_table
+from rates.partition import PartitionFunctions
+from rates.reaclib_file import Reaclib, fit_coefficients
+from rates.reaction import KadonisReaction, reaction_keys
+from rates.temperature import Temperature
+
+TEMPERATURES = (5, 8, 10, 15, 20, 25, 30, 40, 50, 60, 80, 100)
+NUCLIDE_MASS_LIMIT = 350
 
 
 class Kadonis:
@@ -35,7 +45,26 @@ class Kadonis:
 
     Attributes
     ----------
+    index : np.ndarray
+        (119, 351, 2) row of every (Z, A, isomer), -1 if not in the file.
+    nuclide_ids : np.ndarray
+        (N,) nuclide_table id of the target of every row.
+    keys : np.ndarray
+        (N, 9) canonical key of the n capture of every row, see
+        reaction_keys.
+    df : pd.DataFrame
+        One row per reaction, its Reaction column is only built for the rows
+        that are read.
+    reactions : ReactionCache
+        KadonisReaction of a row by row number, built on first access and
+        kept in a bounded cache.
     in_file
+    rows
+    missing
+    rates
+    errors
+    compare
+    to_reaclib
     read_file
 
     """
@@ -51,133 +80,574 @@ class Kadonis:
         elif (file_path is None) and (version is None):
             raise Exception("File not specified")
 
+        file_path = Path(file_path)
         self.file_path = Path(file_path.parent / file_path.stem)
-        try:
-            self.df = pd.read_pickle(str(self.file_path) + ".temp")
-        except:
-            self.df = self.read_file(file_path)
+        self.columns = cache.load(file_path, read_kadonis, "kadonis")
+        self.reactions = ReactionCache(self._reaction)
+        self.df = ReactionFrame.attach(self._data_frame(self.columns), self.reactions)
+        self._interpolators: Dict[Tuple[str, bool], LogLogInterpolator] = {}
+        self.nuclide_ids = nuclide_table.ids(
+            self.columns["Z"], self.columns["A"], self.columns["Key"][:, 2]
+        )
+        self.keys = reaction_keys(
+            np.column_stack(
+                (np.full(len(self), nuclide_table.id("n")), self.nuclide_ids)
+            ),
+            # The capture product is keyed as the ground state, as in
+            # KadonisReaction.
+            nuclide_table.ids(self.columns["Z"], self.columns["A"] + 1),
+        )
+        self._build_index()
 
     def __str__(self) -> str:
         return self.file_path.stem
 
     def __getitem__(self, target: Union[str, "Isotope"]) -> KadonisReaction:
         target = Isotope.name(target)
-        try:
-            return self.df[
-                (self.df["Z"] == target.charge_number)
-                & (self.df["A"] == target.mass_number)
-            ].Reaction.iloc[0]
-        except IndexError:
+        row = self._row(target)
+        if row < 0:
             raise Exception(str(target) + " Not found in file")
+        return self.reactions[row]
 
-    def in_file(self, target: Union[str, "Isotope"]):
-        target = Isotope.name(target)
-        try:
-            self.__getitem__(target)
-            return True
-        except Exception:
-            return False
+    def __len__(self) -> int:
+        return len(self.columns["Z"])
 
-    @staticmethod
-    def read_file(file_path: Union[str, Path]) -> pd.DataFrame:
+    def __iter__(self) -> Iterator[KadonisReaction]:
+        for row in range(len(self)):
+            yield self.reactions[row]
+
+    def in_file(self, target: Union[str, "Isotope"]) -> bool:
+        return self._row(Isotope.name(target)) >= 0
+
+    def rows(
+        self, targets: Union[Sequence[Union[str, "Isotope"]], np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows of many targets at once.
+
+        Parameters
+        ----------
+        targets : [Sequence[Union[str, Isotope]], np.ndarray]
+            Isotopes or names, or an integer array of (Z, A) or
+            (Z, A, isomer) rows.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Row of every target, -1 where it is not in the file, and the mask
+            of the targets found.
         """
+        if isinstance(targets, np.ndarray) and targets.dtype.kind in "iub":
+            key = np.atleast_2d(targets).astype(np.int64)
+        else:
+            key = np.array(
+                [Isotope.name(t).numbers(force_isomer=True) for t in targets],
+                dtype=np.int64,
+            ).reshape(-1, 3)
+        z = key[:, 0]
+        a = key[:, 1]
+        isomer = key[:, 2] if key.shape[1] > 2 else np.zeros_like(z)
+
+        inside = (
+            (z >= 0)
+            & (z < self.index.shape[0])
+            & (a >= 0)
+            & (a < self.index.shape[1])
+            & ((isomer == 0) | (isomer == 1))
+        )
+        rows = np.full(len(key), -1, dtype=np.int64)
+        rows[inside] = self.index[z[inside], a[inside], isomer[inside]]
+        return rows, rows >= 0
+
+    def _row(self, target: Isotope) -> int:
+        z, a, isomer = target.numbers(force_isomer=True)
+        if z < 0 or a < 0 or a > NUCLIDE_MASS_LIMIT:
+            return -1
+        return int(self.index[z, a, int(isomer)])
+
+    def _build_index(self) -> None:
+        """Dense (Z, A, isomer) -> row array over the nuclide chart, the first
+        row wins when a nuclide is listed twice."""
+        key = np.asarray(self.columns["Key"], dtype=np.int64)
+        self.index = np.full(
+            (len(Isotope.symbol), NUCLIDE_MASS_LIMIT + 1, 2), -1, dtype=np.int32
+        )
+        rows = np.arange(len(key), dtype=np.int32)[::-1]
+        self.index[key[::-1, 0], key[::-1, 1], key[::-1, 2]] = rows
+
+    def rates(
+        self,
+        temp: Union[float, np.ndarray, Temperature],
+        scheme: str = "linear",
+        extrapolate: bool = False,
+    ) -> np.ndarray:
+        """Rates of every reaction in the file at once, interpolated in log-log
+        space as KadonisReaction.rate.
 
         Parameters
         ----------
-        file_path :
+        temp : [float, np.ndarray, Temperature]
+            (M,) temperatures in keV unless given as a Temperature.
+        scheme : str {"linear", "cubic"}
+        extrapolate : bool
 
         Returns
         -------
+        np.ndarray
+            (N, M) with one row per row of the file, (N,) for a scalar
+            temperature.
+        """
+        return self.interpolator(scheme, extrapolate)(self._temp(temp))
+
+    def log_rates(
+        self,
+        temp: Union[float, np.ndarray, Temperature],
+        scheme: str = "linear",
+        extrapolate: bool = False,
+    ) -> np.ndarray:
+        """Natural log of rates, interpolated without leaving log space.
+
+        Parameters
+        ----------
+        temp : [float, np.ndarray, Temperature]
+            (M,) temperatures in keV unless given as a Temperature.
+        scheme : str {"linear", "cubic"}
+        extrapolate : bool
 
+        Returns
+        -------
+        np.ndarray
+            (N, M), (N,) for a scalar temperature.
         """
-        file_path = Path(file_path)
+        return self.interpolator(scheme, extrapolate).log(self._temp(temp))
 
-        df = pd.read_csv(
-            file_path,
-            index_col=False,
-            sep="\t",
-            header=0,
-            dtype={"Z": np.uint8, "A": np.uint8, "Isomer": str, "Sym": str},
-            na_values="-",
+    def errors(
+        self,
+        temp: Union[float, np.ndarray, Temperature],
+        scheme: str = "linear",
+        extrapolate: bool = False,
+    ) -> np.ndarray:
+        """Errors of every reaction in the file at once, as
+        KadonisReaction.error.
+
+        Parameters
+        ----------
+        temp : [float, np.ndarray, Temperature]
+            (M,) temperatures in keV unless given as a Temperature.
+        scheme : str {"linear", "cubic"}
+            Interpolation of the rates.
+        extrapolate : bool
+
+        Returns
+        -------
+        np.ndarray
+            (N, M), (N,) for a scalar temperature.
+        """
+        temp = self._temp(temp)
+        return self.interpolator("error", extrapolate)(temp) * self.rates(
+            temp, scheme, extrapolate
         )
 
-        try:
-            df.drop(
-                [" ; reaction rate including SEF in cm3/mole/s"], axis=1, inplace=True
+    def interpolator(
+        self, scheme: str = "linear", extrapolate: bool = False
+    ) -> LogLogInterpolator:
+        """Interpolator of all rates, or of the relative errors for scheme
+        "error", built once per scheme.
+
+        Parameters
+        ----------
+        scheme : str {"linear", "cubic", "error"}
+        extrapolate : bool
+
+        Returns
+        -------
+        LogLogInterpolator
+        """
+        key = (scheme, extrapolate)
+        if key not in self._interpolators:
+            if scheme == "error":
+                self._interpolators[key] = LogLogInterpolator(
+                    TEMPERATURES,
+                    relative_error(self.columns["Rate"], self.columns["Error"]),
+                    extrapolate=extrapolate,
+                    log_y=False,
+                )
+            else:
+                self._interpolators[key] = LogLogInterpolator(
+                    TEMPERATURES, self.columns["Rate"], scheme, extrapolate
+                )
+        return self._interpolators[key]
+
+    def compare(self, other: Union["Kadonis", Reaclib]) -> "RateComparison":
+        """Every rate of the file against the same n capture in another file.
+
+        A Kadonis file is joined in one lookup of all the (Z, A, isomer) keys
+        into its index, from a Reaclib the summed rates of the matching
+        reactions are evaluated on the kT grid in one batch.
+
+        Parameters
+        ----------
+        other : [Kadonis, Reaclib]
+
+        Returns
+        -------
+        RateComparison
+            Of this file relative to other, over all N rows of this file.
+        """
+        if isinstance(other, Reaclib):
+            temp9 = Temperature(np.array(TEMPERATURES, dtype=np.float64), "KeV").gk
+            other_rows, log_rates = other.reaction_log_rates(self.keys, temp9)
+            other_rate = np.exp(log_rates)
+            other_error = np.zeros_like(other_rate)
+        else:
+            other_rows, found = other.rows(np.asarray(self.columns["Key"]))
+            other_rate = np.where(
+                found[:, None], other.columns["Rate"][np.maximum(other_rows, 0)], np.nan
             )
-            version = 1.0
-        except KeyError:
-            df.rename(
-                {"100(keV); reaction rate including SEF in cm3/mole/s": "100"},
-                axis=1,
-                inplace=True,
+            other_error = np.where(
+                found[:, None],
+                other.columns["Error"][np.maximum(other_rows, 0)],
+                np.nan,
             )
-            version = 0.3
-            print("Warning Loading Kadonis in 0.3 format")
-        except:
-            raise Exception
-
-        if version == 1.0:
-            df["Reaction"] = df.apply(
-                lambda df: KadonisReaction(
-                    target=Isotope(df.Z, df.A),
-                    label="Kadonis 1.0",
-                    rr=[
-                        df["RR(5keV)"],
-                        df["RR(8keV)"],
-                        df["RR(10keV)"],
-                        df["RR(15keV)"],
-                        df["RR(20keV)"],
-                        df["RR(25keV)"],
-                        df["RR(30keV)"],
-                        df["RR(40keV)"],
-                        df["RR(50keV)"],
-                        df["RR(60keV)"],
-                        df["RR(80keV)"],
-                        df["RR(100keV)"],
-                    ],
-                    err=[
-                        df["Err(5keV)"],
-                        df["Err(8keV)"],
-                        df["Err(10keV)"],
-                        df["Err(15keV)"],
-                        df["Err(20keV)"],
-                        df["Err(25keV)"],
-                        df["Err(30keV)"],
-                        df["Err(40keV)"],
-                        df["Err(50keV)"],
-                        df["Err(60keV)"],
-                        df["Err(80keV)"],
-                        df["Err(100keV)"],
-                    ],
-                ),
-                axis=1,
+        return RateComparison(
+            self.columns["Rate"],
+            self.columns["Error"],
+            other_rate,
+            other_error,
+            other_rows,
+        )
+
+    def to_reaclib(
+        self,
+        weighted: bool = False,
+        label: str = "ka02",
+        partition_functions: PartitionFunctions = None,
+    ) -> Tuple[Reaclib, np.ndarray, np.ndarray]:
+        """Reaclib sets fitted to the rates of every row at once.
+
+        See fit_coefficients, the fit is done in ln(rate) on the 12 kT points
+        of the file. Rows with an isomer target are left out, reaclib names
+        have no isomers so their sets would read as ground state captures.
+
+        Parameters
+        ----------
+        weighted : bool
+            Weight every point by rate / error. Points without an error get
+            the largest weight of their row, rows without any error are not
+            weighted.
+        label : str
+            Set label of the fitted sets.
+        partition_functions : PartitionFunctions
+            Mass excesses for the Q values, which are 0 if None or unknown.
+
+        Returns
+        -------
+        Tuple[Reaclib, np.ndarray, np.ndarray]
+            Chapter 4 sets of the ground state rows that could be fitted,
+            those rows and their (M, 12) residuals ln(fit) - ln(rate).
+        """
+        weights = None
+        if weighted:
+            relative = relative_error(self.columns["Rate"], self.columns["Error"])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                weights = np.where(relative > 0, 1 / relative, np.nan)
+            largest = np.nanmax(np.where(np.isnan(weights), 0, weights), axis=1)
+            weights = np.where(np.isnan(weights), largest[:, None], weights)
+            weights[largest == 0] = 1.0
+
+        temp9 = Temperature(np.array(TEMPERATURES, dtype=np.float64), "KeV").gk
+        coefficients, residuals = fit_coefficients(temp9, self.columns["Rate"], weights)
+        rows = np.flatnonzero(
+            ~np.isnan(coefficients[:, 0]) & (self.columns["Key"][:, 2] == 0)
+        )
+
+        ids = np.column_stack(
+            (
+                np.full(len(rows), nuclide_table.id("n")),
+                self.nuclide_ids[rows],
+                self.keys[rows, 5],
+            )
+        )
+        q_value = np.zeros(len(rows))
+        if partition_functions is not None:
+            mass_excess = partition_functions.mass_excesses(ids)
+            q_value = np.nan_to_num(
+                mass_excess[:, 0] + mass_excess[:, 1] - mass_excess[:, 2]
             )
 
-        elif version == 0.3:
-            df["Reaction"] = df.apply(
-                lambda df: KadonisReaction(
-                    target=Isotope(df.Z, df.A),
-                    label="Kadonis 0.3",
-                    rr=[
-                        df["5"],
-                        df["8"],
-                        df["10"],
-                        df["15"],
-                        df["20"],
-                        df["25"],
-                        df["30"],
-                        df["40"],
-                        df["50"],
-                        df["60"],
-                        df["80"],
-                        df["100"],
-                    ],
-                    err=[0.0] * 12,
-                ),
-                axis=1,
+        reaclib = Reaclib.from_columns(
+            {
+                "Chapter": np.full(len(rows), 4),
+                "Species": np.column_stack(
+                    (
+                        nuclide_table.reaclib_names(ids),
+                        np.full((len(rows), 3), "", dtype="U5"),
+                    )
+                ).astype("U5"),
+                "SetLabel": np.full(len(rows), label, dtype="U4"),
+                "RateType": np.full(len(rows), "n", dtype="U1"),
+                "ReverseRate": np.full(len(rows), "", dtype="U1"),
+                "QValue": q_value,
+                "Rate": coefficients[rows],
+            }
+        )
+        return reaclib, rows, residuals[rows]
+
+    @property
+    def missing(self) -> np.ndarray:
+        """(N, 12) mask of the rates missing from the file."""
+        return np.isnan(self.columns["Rate"])
+
+    @staticmethod
+    def _temp(temp: Union[float, np.ndarray, Temperature]) -> np.ndarray:
+        return temp.kev if isinstance(temp, Temperature) else temp
+
+    @classmethod
+    def read_file(cls, file_path: Union[str, Path]) -> pd.DataFrame:
+        """
+
+        Parameters
+        ----------
+        file_path :
+
+        Returns
+        -------
+        pd.DataFrame
+
+        """
+        return cls(file_path).df
+
+    @staticmethod
+    def _data_frame(columns: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """Columns of df built from the cached columns.
+
+        Parameters
+        ----------
+        columns : Dict[str, np.ndarray]
+            Output of read_kadonis.
+
+        Returns
+        -------
+        Dict[str, Any]
+
+        """
+        version = float(columns["Version"])
+        isomer = columns["Isomer"].astype(object)
+        isomer[isomer == ""] = np.nan
+
+        kadonis: Dict[str, Any] = {
+            "Z": columns["Z"].astype(np.uint8),
+            "A": columns["A"].astype(np.uint8),
+            "Isomer": isomer,
+            "Sym": columns["Sym"],
+        }
+        for i, temp in enumerate(TEMPERATURES):
+            if version == 1.0:
+                kadonis["RR({0}keV)".format(temp)] = columns["Rate"][:, i]
+                kadonis["Err({0}keV)".format(temp)] = columns["Error"][:, i]
+            else:
+                kadonis[str(temp)] = columns["Rate"][:, i]
+
+        return kadonis
+
+    def _reaction(self, row: int) -> KadonisReaction:
+        return KadonisReaction(
+            target=Isotope(
+                self.columns["Z"][row],
+                self.columns["A"][row],
+                bool(self.columns["Key"][row, 2]),
+            ),
+            label="Kadonis {0}".format(float(self.columns["Version"])),
+            rr=self.columns["Rate"][row],
+            err=self.columns["Error"][row],
+        )
+
+
+class RateComparison:
+    """Row by row comparison of two sets of rates on the Kadonis kT grid.
+
+    Parameters
+    ----------
+    rate, error : np.ndarray
+        (N, 12) rates and absolute errors being compared.
+    other_rate, other_error : np.ndarray
+        (N, 12) rates and errors compared against, NaN where missing.
+    other_rows : np.ndarray
+        (N,) row (or Reaclib group) of other matching every row, -1 if none.
+
+    Attributes
+    ----------
+    found : np.ndarray
+        (N,) mask of the rows with a match.
+    ratio : np.ndarray
+        (N, 12) rate / other_rate.
+    difference : np.ndarray
+        (N, 12) rate - other_rate.
+    significance : np.ndarray
+        (N, 12) difference in units of the combined uncertainty
+        sqrt(error**2 + other_error**2), NaN where that is zero.
+
+    """
+
+    def __init__(
+        self,
+        rate: np.ndarray,
+        error: np.ndarray,
+        other_rate: np.ndarray,
+        other_error: np.ndarray,
+        other_rows: np.ndarray,
+    ) -> None:
+        self.other_rows = np.asarray(other_rows)
+        self.found = self.other_rows >= 0
+        self.difference = np.asarray(rate) - other_rate
+        uncertainty = np.hypot(error, other_error)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.ratio = np.asarray(rate) / other_rate
+            self.significance = np.where(
+                uncertainty > 0, self.difference / uncertainty, np.nan
             )
 
-        pickle_path = "{0}.temp".format(str(file_path.parent / file_path.stem))
-        df.to_pickle(pickle_path)
-        return df
+    def __len__(self) -> int:
+        return len(self.other_rows)
+
+    @property
+    def deviation(self) -> np.ndarray:
+        """(N, 12) relative deviation |ratio - 1|."""
+        return np.abs(self.ratio - 1)
+
+    def max_deviation(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Largest deviation of every row and the kT (keV) where it occurs.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            (N,) each, NaN for the rows without any value to compare.
+        """
+        deviation = self.deviation
+        valid = ~np.isnan(deviation)
+        column = np.argmax(np.where(valid, deviation, -np.inf), axis=1)
+        has_value = valid.any(axis=1)
+        largest = np.where(
+            has_value, deviation[np.arange(len(deviation)), column], np.nan
+        )
+        return largest, np.where(has_value, np.array(TEMPERATURES)[column], np.nan)
+
+    def outliers(self, sigma: float = 3.0, tolerance: float = None) -> np.ndarray:
+        """(N,) mask of the rows that disagree anywhere on the grid.
+
+        Parameters
+        ----------
+        sigma : float
+            Rows differing by more than sigma combined uncertainties.
+        tolerance : float
+            Also rows deviating by more than this relative amount, which
+            catches the rows without uncertainties.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        with np.errstate(invalid="ignore"):
+            outlier = (np.abs(self.significance) > sigma).any(axis=1)
+            if tolerance is not None:
+                outlier |= (self.deviation > tolerance).any(axis=1)
+        return outlier
+
+    def summary(self, sigma: float = 3.0, tolerance: float = None) -> pd.DataFrame:
+        """One row of statistics per compared row, aligned with Kadonis.df.
+
+        Parameters
+        ----------
+        sigma : float
+        tolerance : float
+            See outliers.
+
+        Returns
+        -------
+        pd.DataFrame
+            Found, MaxDeviation, MaxDeviationKT, MaxSignificance and Outlier.
+        """
+        largest, kt = self.max_deviation()
+        significance = np.abs(self.significance)
+        has_value = (~np.isnan(significance)).any(axis=1)
+        return pd.DataFrame(
+            {
+                "Found": self.found,
+                "MaxDeviation": largest,
+                "MaxDeviationKT": kt,
+                "MaxSignificance": np.where(
+                    has_value,
+                    np.max(np.nan_to_num(significance, nan=-np.inf), axis=1),
+                    np.nan,
+                ),
+                "Outlier": self.outliers(sigma, tolerance),
+            }
+        )
+
+
+def read_kadonis(file_path: Union[str, Path]) -> Dict[str, np.ndarray]:
+    """Reads a Kadonis file into columns.
+
+    The version is taken from the header line, which is read once before
+    the body is parsed straight into the rate and error columns.
+
+    Parameters
+    ----------
+    file_path : Union[str, Path]
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Z (n,), A (n,), Isomer (n,), Sym (n,), Key (n, 3) of Z, A and
+        whether the target is an isomer, Rate (n, 12), Error (n, 12) and the
+        file Version. Missing values ("-") are NaN.
+
+    """
+    with open(file_path) as kadonis:
+        header = kadonis.readline().rstrip("\r\n").split("\t")
+
+    if header[-1] == " ; reaction rate including SEF in cm3/mole/s":
+        version = 1.0
+        names = ["Z", "A", "Isomer", "Sym"] + [
+            "{0}{1}".format(kind, i) for i in range(len(TEMPERATURES)) for kind in "RE"
+        ]
+    elif header[-1] == "100(keV); reaction rate including SEF in cm3/mole/s":
+        version = 0.3
+        print("Warning Loading Kadonis in 0.3 format")
+        names = ["Z", "A", "Isomer", "Sym"] + [
+            "R{0}".format(i) for i in range(len(TEMPERATURES))
+        ]
+    else:
+        raise Exception("Unknown Kadonis format")
+
+    df = pd.read_csv(
+        file_path,
+        sep="\t",
+        skiprows=1,
+        header=None,
+        names=names,
+        usecols=range(len(names)),
+        index_col=False,
+        dtype={"Isomer": str, "Sym": str},
+        na_values="-",
+        keep_default_na=False,
+    )
+    rates = df[["R{0}".format(i) for i in range(len(TEMPERATURES))]]
+    if version == 1.0:
+        errors = df[["E{0}".format(i) for i in range(len(TEMPERATURES))]]
+    else:
+        errors = np.zeros(rates.shape)
+
+    z = df.Z.to_numpy(dtype=np.int16)
+    a = df.A.to_numpy(dtype=np.int16)
+    isomer = df.Isomer.fillna("").to_numpy(dtype="U1")
+
+    return {
+        "Z": z,
+        "A": a,
+        "Isomer": isomer,
+        "Sym": df.Sym.to_numpy(dtype="U2"),
+        "Key": np.stack((z, a, isomer == "m"), axis=1).astype(np.int16),
+        "Rate": np.ascontiguousarray(rates, dtype=np.float64),
+        "Error": np.ascontiguousarray(errors, dtype=np.float64),
+        "Version": np.array(version),
+    }
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Lazy access to the Reaction objects of a rate file."""
+
+from collections import OrderedDict
+from typing import Callable
+
+import pandas as pd
+
+from rates.reaction import Reaction
+
+REACTION_CACHE_SIZE = 4096
+
+
+class ReactionCache:
+    """Bounded least recently used cache of the Reaction of each table row.
+
+    Parameters
+    ----------
+    factory : Callable[[int], Reaction]
+        Builds the Reaction of a row from the columnar data.
+    maxsize : int
+        Number of Reaction objects kept alive at most.
+
+    """
+
+    def __init__(
+        self, factory: Callable[[int], Reaction], maxsize: int = REACTION_CACHE_SIZE
+    ) -> None:
+        self.factory = factory
+        self.maxsize = maxsize
+        self._reactions: "OrderedDict[int, Reaction]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._reactions)
+
+    def __getitem__(self, row: int) -> Reaction:
+        row = int(row)
+        try:
+            self._reactions.move_to_end(row)
+            return self._reactions[row]
+        except KeyError:
+            pass
+
+        reaction = self.factory(row)
+        self._reactions[row] = reaction
+        if len(self._reactions) > self.maxsize:
+            self._reactions.popitem(last=False)
+        return reaction
+
+    def clear(self) -> None:
+        """Drops all cached Reaction objects."""
+        self._reactions.clear()
+
+
+class ReactionFrame(pd.DataFrame):
+    """DataFrame whose Reaction column is only built when it is read.
+
+    The index must be the row number in the file, which is kept by
+    filtering, so `df[df.Chapter == 4].Reaction` only builds the Reaction
+    objects of the selected rows.
+
+    Attributes
+    ----------
+    Reaction : pd.Series
+        Reaction object of every row in the frame.
+
+    """
+
+    _metadata = ["_reactions"]
+    _reactions = None
+
+    @property
+    def _constructor(self):
+        return ReactionFrame
+
+    @property
+    def Reaction(self) -> pd.Series:
+        if self._reactions is None:
+            raise AttributeError("Frame is not attached to a rate file")
+        return pd.Series(
+            [self._reactions[row] for row in self.index],
+            index=self.index,
+            name="Reaction",
+            dtype=object,
+        )
+
+    @classmethod
+    def attach(cls, data: dict, reactions: ReactionCache) -> "ReactionFrame":
+        """Builds a frame whose Reaction column comes from a ReactionCache.
+
+        Parameters
+        ----------
+        data : dict
+            Columns of the frame, one row per row of the file.
+        reactions : ReactionCache
+
+        Returns
+        -------
+        ReactionFrame
+        """
+        frame = cls(data)
+        frame._reactions = reactions
+        return frame
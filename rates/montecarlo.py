@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Monte Carlo variation of reaction rates and the perturbed libraries."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from rates.interpolate import relative_error
+from rates.kadonis_file import TEMPERATURES, Kadonis
+from rates.nuclides import nuclide_table
+from rates.reaclib_file import Reaclib, ReaclibTemplate
+from rates.reaction import reaction_keys
+
+DISTRIBUTIONS = ("lognormal", "loguniform")
+
+# Sampler of the worker processes, set once per process by _start_worker.
+_worker_sampler = None
+
+
+class RateSampler:
+    """Random factors on the rates of some reactions of a Reaclib.
+
+    A factor f multiplies every set of its reaction, which is a0 += ln(f),
+    so a sample only changes the a0 of those sets and the libraries are
+    written from a ReaclibTemplate.
+
+    Parameters
+    ----------
+    reaclib : Reaclib
+    groups : np.ndarray
+        (G,) reactions to vary, see Reaclib.group.
+    width : [float, np.ndarray]
+        Scalar or (G,) width in ln(f), the standard deviation for
+        "lognormal" and the half width for "loguniform".
+    distribution : str {"lognormal", "loguniform"}
+    old_format : bool
+        Write the libraries in the 3 line format.
+
+    Attributes
+    ----------
+    groups : np.ndarray
+    width : np.ndarray
+        (G,)
+    rows : np.ndarray
+        (K,) sets of the varied reactions, in increasing order.
+    owner : np.ndarray
+        (K,) position in groups of the reaction of every set in rows.
+    template : ReaclibTemplate
+
+    """
+
+    def __init__(
+        self,
+        reaclib: Reaclib,
+        groups: np.ndarray,
+        width: Union[float, np.ndarray],
+        distribution: str = "lognormal",
+        old_format: bool = False,
+    ) -> None:
+        if distribution not in DISTRIBUTIONS:
+            raise Exception(distribution + " is not a supported distribution")
+        self.groups = np.asarray(groups, dtype=np.int64)
+        self.width = np.broadcast_to(
+            np.asarray(width, dtype=np.float64), self.groups.shape
+        ).copy()
+        self.distribution = distribution
+
+        position = np.full(len(reaclib.group_starts) - 1, -1, dtype=np.int64)
+        position[self.groups] = np.arange(len(self.groups))
+        self.rows = np.flatnonzero(position[reaclib.group] >= 0)
+        self.owner = position[reaclib.group[self.rows]]
+        self.template = ReaclibTemplate(reaclib, old_format)
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    @classmethod
+    def from_uncertainties(
+        cls,
+        reaclib: Reaclib,
+        table: Union[str, Path, pd.DataFrame],
+        distribution: str = "loguniform",
+        old_format: bool = False,
+    ) -> "RateSampler":
+        """Sampler of the n captures of an uncertainty table.
+
+        The table has a row per target with Charge, Mass, MinRate, MaxRate
+        and ExperimentalUncert(%) columns, as notebooks/uncertainties.csv.
+        The width is half of ln(MaxRate / MinRate), or ln(1 + uncertainty)
+        where that is larger. Only the spread is taken from the table, the
+        factors multiply the reaclib rates and so are centred on them, not
+        on the geometric mean of MinRate and MaxRate. Targets without an n
+        capture in reaclib or without any uncertainty are left out.
+
+        Parameters
+        ----------
+        reaclib : Reaclib
+        table : [str, Path, pd.DataFrame]
+        distribution : str {"lognormal", "loguniform"}
+        old_format : bool
+
+        Returns
+        -------
+        RateSampler
+        """
+        if not isinstance(table, pd.DataFrame):
+            table = pd.read_csv(table)
+        charge = table.Charge.to_numpy(dtype=np.int64)
+        mass = table.Mass.to_numpy(dtype=np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            width = np.fmax(
+                0.5
+                * np.log(table.MaxRate.to_numpy(float) / table.MinRate.to_numpy(float)),
+                np.log1p(table["ExperimentalUncert(%)"].to_numpy(float) / 100),
+            )
+        return cls._n_captures(reaclib, charge, mass, width, distribution, old_format)
+
+    @classmethod
+    def from_kadonis(
+        cls,
+        reaclib: Reaclib,
+        kadonis: Kadonis,
+        kt: float = 30,
+        scale: float = 1.0,
+        distribution: str = "lognormal",
+        old_format: bool = False,
+    ) -> "RateSampler":
+        """Sampler of the n captures of a Kadonis file, with the width set by
+        its relative errors.
+
+        Parameters
+        ----------
+        reaclib : Reaclib
+        kadonis : Kadonis
+        kt : float
+            keV of the Kadonis errors used, one of its temperatures.
+        scale : float
+            Width in units of ln(1 + error / rate).
+        distribution : str {"lognormal", "loguniform"}
+        old_format : bool
+
+        Returns
+        -------
+        RateSampler
+        """
+        column = TEMPERATURES.index(kt)
+        relative = relative_error(
+            kadonis.columns["Rate"][:, column], kadonis.columns["Error"][:, column]
+        )
+        return cls._n_captures(
+            reaclib,
+            kadonis.columns["Z"],
+            kadonis.columns["A"],
+            scale * np.log1p(relative),
+            distribution,
+            old_format,
+        )
+
+    @classmethod
+    def _n_captures(
+        cls,
+        reaclib: Reaclib,
+        charge: np.ndarray,
+        mass: np.ndarray,
+        width: np.ndarray,
+        distribution: str,
+        old_format: bool,
+    ) -> "RateSampler":
+        """Sampler of the n captures on (charge, mass) targets found in
+        reaclib with a finite, positive width."""
+        targets = nuclide_table.ids(charge, mass)
+        keys = reaction_keys(
+            np.column_stack((np.full(len(targets), nuclide_table.id("n")), targets)),
+            nuclide_table.ids(charge, np.asarray(mass) + 1),
+        )
+        groups = reaclib.key_groups(keys)
+        keep = (groups >= 0) & np.isfinite(width) & (width > 0)
+        groups, first = np.unique(groups[keep], return_index=True)
+        return cls(reaclib, groups, width[keep][first], distribution, old_format)
+
+    def sample(
+        self, seed: Union[int, np.random.SeedSequence, np.random.Generator] = None
+    ) -> np.ndarray:
+        """(G,) factors of one library.
+
+        Parameters
+        ----------
+        seed : [int, np.random.SeedSequence, np.random.Generator]
+
+        Returns
+        -------
+        np.ndarray
+        """
+        rng = np.random.default_rng(seed)
+        if self.distribution == "lognormal":
+            return np.exp(rng.normal(0.0, self.width))
+        return np.exp(rng.uniform(-self.width, self.width))
+
+    def apply(self, factors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Sets changed by factors and their new a0.
+
+        Parameters
+        ----------
+        factors : np.ndarray
+            (G,)
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            rows and (K,) a0, the other sets are unchanged.
+        """
+        return self.rows, self.template.a0[self.rows] + np.log(factors)[self.owner]
+
+    def write(self, file_path: Union[str, Path], factors: np.ndarray) -> None:
+        """Writes the library with the rates multiplied by factors.
+
+        Parameters
+        ----------
+        file_path : [str, Path]
+        factors : np.ndarray
+            (G,)
+        """
+        self.template.write(file_path, *self.apply(factors))
+
+    def write_many(
+        self,
+        directory: Union[str, Path],
+        count: int,
+        seed: int = 0,
+        processes: int = None,
+        name: str = "reaclib_{0:05d}",
+    ) -> np.ndarray:
+        """Writes count perturbed libraries across a process pool.
+
+        Library i is drawn from SeedSequence(seed, spawn_key=(i,)), the i th
+        child of SeedSequence(seed), so the libraries do not depend on the
+        number of processes or on the order they are written in.
+
+        Parameters
+        ----------
+        directory : [str, Path]
+        count : int
+        seed : int
+        processes : int
+            Number of worker processes, os.cpu_count() if None, 1 writes in
+            this process.
+        name : str
+            File name of library i, formatted with i.
+
+        Returns
+        -------
+        np.ndarray
+            (count, G) factors of every library.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        processes = min(processes or os.cpu_count() or 1, max(count, 1))
+        chunks = [
+            (str(directory), name, seed, indices.tolist())
+            for indices in np.array_split(np.arange(count), 4 * processes)
+            if len(indices)
+        ]
+
+        if processes == 1:
+            results = [_write_chunk(chunk, self) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(
+                processes, initializer=_start_worker, initargs=(self,)
+            ) as pool:
+                results = list(pool.map(_write_chunk, chunks))
+        return np.concatenate(results).reshape(count, len(self))
+
+
+def _start_worker(sampler: RateSampler) -> None:
+    global _worker_sampler
+    _worker_sampler = sampler
+
+
+def _write_chunk(
+    chunk: Tuple[str, str, int, List[int]], sampler: RateSampler = None
+) -> np.ndarray:
+    """Writes the libraries of a chunk of indices and returns their factors."""
+    if sampler is None:
+        sampler = _worker_sampler
+    directory, name, seed, indices = chunk
+    factors = np.empty((len(indices), len(sampler)))
+    for row, index in enumerate(indices):
+        factors[row] = sampler.sample(np.random.SeedSequence(seed, spawn_key=(index,)))
+        sampler.write(Path(directory) / name.format(index), factors[row])
+    return factors
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Graph of the reaction network held in a Reaclib library."""
+
+from typing import Iterable, List, Union
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from rates.isotope import Isotope
+from rates.nuclides import nuclide_table
+from rates.reaclib_file import Reaclib
+
+# Light particles taking part in most reactions, they are not followed as
+# graph nodes unless a reaction has nothing else.
+LIGHT_PARTICLES = ("n", "p", "d", "t", "he3", "he4")
+
+IsotopeList = Iterable[Union[Isotope, str]]
+
+
+class ReactionGraph:
+    """Nuclides as nodes and reaclib sets as edges, built once from a Reaclib.
+
+    Parameters
+    ----------
+    reaclib : Reaclib
+    light : Iterable[Union[Isotope, str]]
+        Nuclides that do not start or end an edge in the adjacency, unless a
+        set consists only of them.
+
+    Attributes
+    ----------
+    reaclib : Reaclib
+    nuclides : np.ndarray
+        (K,) nuclide_table ids of the nodes, sorted.
+    targets : sparse.csr_matrix
+        (K, N) number of times each nuclide is a target of each set.
+    products : sparse.csr_matrix
+        (K, N) number of times each nuclide is a product of each set.
+    stoichiometry : sparse.csr_matrix
+        (K, N) products - targets, the net change of every nuclide per set.
+    adjacency : sparse.csr_matrix
+        (K, K) number of sets leading from a target node to a product node.
+    light : np.ndarray
+        (K,) mask of the light particle nodes.
+    target_nodes : np.ndarray
+        (N, 4) node of every target of every set, -1 for none.
+    product_nodes : np.ndarray
+        (N, 4) node of every product of every set, -1 for none.
+
+    """
+
+    def __init__(self, reaclib: Reaclib, light: IsotopeList = LIGHT_PARTICLES):
+        self.reaclib = reaclib
+        target_ids = reaclib.target_ids
+        product_ids = reaclib.product_ids
+
+        self.nuclides = np.unique(
+            np.concatenate((target_ids.ravel(), product_ids.ravel()))
+        )
+        self.nuclides = self.nuclides[self.nuclides >= 0]
+        self._node = np.full(max(len(nuclide_table), 1), -1, dtype=np.int64)
+        self._node[self.nuclides] = np.arange(len(self.nuclides))
+
+        targets = np.where(target_ids >= 0, self._node[target_ids], -1)
+        products = np.where(product_ids >= 0, self._node[product_ids], -1)
+        self.target_nodes = targets
+        self.product_nodes = products
+        self.targets = self._incidence(targets)
+        self.products = self._incidence(products)
+        self.stoichiometry = (self.products - self.targets).tocsr()
+
+        self.light = np.isin(self.nuclides, nuclide_table.isotope_ids(light))
+        heavy_targets = self._heavy(targets, self.light)
+        heavy_products = self._heavy(products, self.light)
+        source = np.repeat(heavy_targets, heavy_products.shape[1], axis=1).ravel()
+        destination = np.tile(heavy_products, (1, heavy_targets.shape[1])).ravel()
+        edge = (source >= 0) & (destination >= 0)
+        self.adjacency = sparse.csr_matrix(
+            (np.ones(edge.sum(), dtype=np.int64), (source[edge], destination[edge])),
+            shape=(len(self.nuclides),) * 2,
+        )
+        self.adjacency.sum_duplicates()
+
+    def __len__(self) -> int:
+        return len(self.nuclides)
+
+    def _incidence(self, nodes: np.ndarray) -> sparse.csr_matrix:
+        rows = np.broadcast_to(np.arange(len(nodes))[:, None], nodes.shape)
+        valid = nodes >= 0
+        incidence = sparse.csr_matrix(
+            (np.ones(valid.sum(), dtype=np.int64), (nodes[valid], rows[valid])),
+            shape=(len(self.nuclides), len(nodes)),
+        )
+        incidence.sum_duplicates()
+        return incidence
+
+    @staticmethod
+    def _heavy(nodes: np.ndarray, light: np.ndarray) -> np.ndarray:
+        """nodes with light particles removed, unless that leaves nothing."""
+        is_light = (nodes >= 0) & light[np.maximum(nodes, 0)]
+        only_light = ~((nodes >= 0) & ~is_light).any(axis=1)
+        return np.where(is_light & ~only_light[:, None], -1, nodes)
+
+    def node(self, isotopes: Union[IsotopeList, Isotope, str]) -> np.ndarray:
+        """Node numbers of isotopes, -1 for isotopes not in the network.
+
+        Parameters
+        ----------
+        isotopes : [Iterable[Union[Isotope, str]], Isotope, str]
+
+        Returns
+        -------
+        np.ndarray
+        """
+        if isinstance(isotopes, (str, Isotope)):
+            isotopes = [isotopes]
+        ids = nuclide_table.isotope_ids(isotopes)
+        nodes = np.full(len(ids), -1, dtype=np.int64)
+        known = ids < len(self._node)
+        nodes[known] = self._node[ids[known]]
+        return nodes
+
+    def isotopes(self, nodes: np.ndarray) -> List[Isotope]:
+        """Isotope objects of node numbers."""
+        return nuclide_table.isotopes(self.nuclides[np.asarray(nodes)])
+
+    def producing(self, isotope: Union[Isotope, str]) -> np.ndarray:
+        """Rows of the sets that have isotope as a product."""
+        return self._row_sets(self.products, isotope)
+
+    def destroying(self, isotope: Union[Isotope, str]) -> np.ndarray:
+        """Rows of the sets that have isotope as a target."""
+        return self._row_sets(self.targets, isotope)
+
+    def _row_sets(self, incidence: sparse.csr_matrix, isotope) -> np.ndarray:
+        (node,) = self.node(isotope)
+        if node < 0:
+            return np.empty(0, dtype=np.int64)
+        return incidence.indices[incidence.indptr[node] : incidence.indptr[node + 1]]
+
+    def successors(self, isotope: Union[Isotope, str]) -> List[Isotope]:
+        """Nuclides made directly from isotope."""
+        (node,) = self.node(isotope)
+        if node < 0:
+            return []
+        return self.isotopes(
+            self.adjacency.indices[
+                self.adjacency.indptr[node] : self.adjacency.indptr[node + 1]
+            ]
+        )
+
+    def predecessors(self, isotope: Union[Isotope, str]) -> List[Isotope]:
+        """Nuclides that make isotope directly."""
+        (node,) = self.node(isotope)
+        if node < 0:
+            return []
+        return self.isotopes(self.adjacency[:, node].nonzero()[0])
+
+    def reachable(
+        self, seeds: Union[IsotopeList, Isotope, str], max_steps: int = None
+    ) -> np.ndarray:
+        """Mask of the nodes reachable from the seeds, seeds included.
+
+        Parameters
+        ----------
+        seeds : [Iterable[Union[Isotope, str]], Isotope, str]
+        max_steps : int
+            Number of reactions to follow at most, unlimited if None.
+
+        Returns
+        -------
+        np.ndarray
+            (K,) boolean mask over nuclides.
+        """
+        seeds = self.node(seeds)
+        reached = np.zeros(len(self), dtype=bool)
+        reached[seeds[seeds >= 0]] = True
+        frontier = reached.copy()
+        steps = 0
+        while frontier.any() and (max_steps is None or steps < max_steps):
+            frontier = (self.adjacency.T @ frontier) > 0
+            frontier &= ~reached
+            reached |= frontier
+            steps += 1
+        return reached
+
+    def path(
+        self, source: Union[Isotope, str], target: Union[Isotope, str]
+    ) -> List[Isotope]:
+        """Shortest chain of nuclides from source to target.
+
+        Parameters
+        ----------
+        source : [Isotope, str]
+        target : [Isotope, str]
+
+        Returns
+        -------
+        List[Isotope]
+            Source first and target last, empty if target is not reachable.
+        """
+        (start,) = self.node(source)
+        (end,) = self.node(target)
+        if start < 0 or end < 0:
+            return []
+        _, predecessors = csgraph.breadth_first_order(
+            self.adjacency, start, directed=True, return_predecessors=True
+        )
+        if end != start and predecessors[end] < 0:
+            return []
+
+        nodes = [end]
+        while nodes[-1] != start:
+            nodes.append(predecessors[nodes[-1]])
+        return self.isotopes(nodes[::-1])
+
+    def connecting(
+        self, target: Union[Isotope, str], product: Union[Isotope, str]
+    ) -> np.ndarray:
+        """Rows of the sets with target as a target and product as a product."""
+        return np.intersect1d(self.destroying(target), self.producing(product))
+
+    def subnetwork(
+        self, isotopes: Union[IsotopeList, np.ndarray], include_light: bool = True
+    ) -> Reaclib:
+        """Reaclib of the sets whose species are all in a set of nuclides.
+
+        Parameters
+        ----------
+        isotopes : [Iterable[Union[Isotope, str]], np.ndarray]
+            Nuclides to keep, or a (K,) boolean node mask such as the output
+            of reachable.
+        include_light : bool
+            Keep the light particles in addition to isotopes.
+
+        Returns
+        -------
+        Reaclib
+        """
+        if isinstance(isotopes, np.ndarray) and isotopes.dtype == bool:
+            keep = isotopes.copy()
+        else:
+            nodes = self.node(isotopes)
+            keep = np.zeros(len(self), dtype=bool)
+            keep[nodes[nodes >= 0]] = True
+        if include_light:
+            keep |= self.light
+
+        outside = (self.targets + self.products).T @ (~keep).astype(np.int64)
+        return self.reaclib.subset(outside == 0)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Integer ids for nuclides, shared by all the rate libraries."""
+
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+from rates.isotope import Isotope
+
+ID_DTYPE = np.int32
+MAX_CHARGE = 118
+MAX_MASS = 350
+
+
+class NuclideTable:
+    """Registry giving every (Z, A, isomer) a compact integer id.
+
+    Ids are handed out in the order nuclides are first seen and never
+    change, so arrays of ids from different libraries can be compared
+    directly. The properties of every nuclide are held in parallel arrays
+    indexed by id, -1 is used for "no nuclide" (e.g. empty reaclib species).
+
+    Attributes
+    ----------
+    charge_number : np.ndarray
+    mass_number : np.ndarray
+    isomer : np.ndarray
+    stable : np.ndarray
+        True if the nuclide is in Isotope.stable_isotopes.
+    primordial : np.ndarray
+        True if the nuclide is in Isotope.primordial.
+    symbol : np.ndarray
+        Index of the element symbol in Isotope.symbol.
+    name : np.ndarray
+        str(Isotope), e.g. "He4".
+    ppn_name : np.ndarray
+        Isotope.ppn_name, e.g. b"AL 27".
+    index : np.ndarray
+        (119, 351, 2) id of every (Z, A, isomer), -1 if not registered.
+
+    """
+
+    def __init__(self) -> None:
+        self.index = np.full((MAX_CHARGE + 1, MAX_MASS + 1, 2), -1, dtype=ID_DTYPE)
+        self.charge_number = np.empty(0, dtype=np.int16)
+        self.mass_number = np.empty(0, dtype=np.int16)
+        self.isomer = np.empty(0, dtype=bool)
+        self.stable = np.empty(0, dtype=bool)
+        self.primordial = np.empty(0, dtype=bool)
+        self.symbol = np.empty(0, dtype=np.int16)
+        self.name = np.empty(0, dtype="U5")
+        self.ppn_name = np.empty(0, dtype="S5")
+        self._isotope_ids: Dict[Isotope, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.charge_number)
+
+    def ids(
+        self,
+        charge_number: Union[int, np.ndarray],
+        mass_number: Union[int, np.ndarray],
+        isomer: Union[bool, np.ndarray] = False,
+    ) -> np.ndarray:
+        """Ids of nuclides, registering the ones not seen before.
+
+        Parameters
+        ----------
+        charge_number : [int, np.ndarray]
+        mass_number : [int, np.ndarray]
+        isomer : [bool, np.ndarray]
+
+        Returns
+        -------
+        np.ndarray
+            Broadcast shape of the inputs.
+        """
+        charge_number, mass_number, isomer = self._key(
+            charge_number, mass_number, isomer
+        )
+        ids = self.index[charge_number, mass_number, isomer]
+        new = ids < 0
+        if np.any(new):
+            self._register(charge_number[new], mass_number[new], isomer[new])
+            ids = self.index[charge_number, mass_number, isomer]
+        return ids
+
+    def find(
+        self,
+        charge_number: Union[int, np.ndarray],
+        mass_number: Union[int, np.ndarray],
+        isomer: Union[bool, np.ndarray] = False,
+    ) -> np.ndarray:
+        """Ids of nuclides without registering new ones.
+
+        Parameters
+        ----------
+        charge_number : [int, np.ndarray]
+        mass_number : [int, np.ndarray]
+        isomer : [bool, np.ndarray]
+
+        Returns
+        -------
+        np.ndarray
+            -1 where the nuclide is not registered.
+        """
+        return self.index[self._key(charge_number, mass_number, isomer)]
+
+    def id(self, isotope: Union[str, Isotope]) -> int:
+        """Id of a single isotope or name."""
+        isotope = Isotope.name(isotope)
+        return int(self.ids(isotope.charge_number, isotope.mass_number, isotope.isomer))
+
+    def isotope_ids(self, isotopes: Iterable[Union[str, Isotope]]) -> np.ndarray:
+        """Ids of Isotope objects or names.
+
+        Parameters
+        ----------
+        isotopes : Iterable[Union[str, Isotope]]
+
+        Returns
+        -------
+        np.ndarray
+        """
+        numbers = np.array(
+            [Isotope.name(iso).numbers(force_isomer=True) for iso in isotopes],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        return self.ids(numbers[:, 0], numbers[:, 1], numbers[:, 2])
+
+    def isotopes(self, ids: Union[int, np.ndarray]) -> List[Isotope]:
+        """Isotope objects of ids, None for -1.
+
+        Parameters
+        ----------
+        ids : [int, np.ndarray]
+
+        Returns
+        -------
+        List[Isotope]
+        """
+        return [
+            Isotope(self.charge_number[i], self.mass_number[i], self.isomer[i])
+            if i >= 0
+            else None
+            for i in np.ravel(ids).tolist()
+        ]
+
+    def reaclib_ids(self, names: np.ndarray) -> np.ndarray:
+        """Ids of reaclib species strings, e.g. "n", "he4" or "al26".
+
+        Every distinct string is only parsed once.
+
+        Parameters
+        ----------
+        names : np.ndarray
+            Species strings of any shape, "" for no species.
+
+        Returns
+        -------
+        np.ndarray
+            Same shape as names, -1 for "".
+        """
+        unique, inverse = np.unique(np.asarray(names, dtype=str), return_inverse=True)
+        named = unique != ""
+        numbers = np.array(
+            [
+                Isotope.name(name).numbers(force_isomer=True)
+                for name in unique[named].tolist()
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        ids = np.full(len(unique), -1, dtype=ID_DTYPE)
+        ids[named] = self.ids(numbers[:, 0], numbers[:, 1], numbers[:, 2])
+        return ids[inverse].reshape(np.shape(names))
+
+    def reaclib_names(self, ids: np.ndarray) -> np.ndarray:
+        """Reaclib species strings of ids, "" for -1.
+
+        Parameters
+        ----------
+        ids : np.ndarray
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return np.where(np.asarray(ids) >= 0, np.char.lower(self.name)[ids], "")
+
+    def ppn_ids(self, ppn_names: np.ndarray) -> np.ndarray:
+        """Ids of names in the ppn fixed width format, e.g. "AL 27".
+
+        Parameters
+        ----------
+        ppn_names : np.ndarray
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return self.ids(*Isotope.ppn_names_to_numbers(ppn_names))
+
+    def ppn_names(self, ids: np.ndarray) -> np.ndarray:
+        """ppn names of ids.
+
+        Parameters
+        ----------
+        ids : np.ndarray
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return self.ppn_name[ids]
+
+    def _key(self, charge_number, mass_number, isomer):
+        charge_number, mass_number, isomer = np.broadcast_arrays(
+            np.asarray(charge_number, dtype=np.int64),
+            np.asarray(mass_number, dtype=np.int64),
+            np.asarray(isomer, dtype=np.int64),
+        )
+        if (
+            np.any(charge_number < 0)
+            or np.any(charge_number > MAX_CHARGE)
+            or np.any(mass_number < 0)
+            or np.any(mass_number > MAX_MASS)
+            or np.any((isomer != 0) & (isomer != 1))
+        ):
+            raise ValueError("Nuclide outside of the chart")
+        return charge_number, mass_number, isomer
+
+    def _register(
+        self, charge_number: np.ndarray, mass_number: np.ndarray, isomer: np.ndarray
+    ) -> None:
+        key = np.unique(np.stack((charge_number, mass_number, isomer), axis=1), axis=0)
+        new = [Isotope(z, a, i) for z, a, i in key.tolist()]
+
+        self.index[key[:, 0], key[:, 1], key[:, 2]] = np.arange(
+            len(self), len(self) + len(key), dtype=ID_DTYPE
+        )
+        self.charge_number = np.append(self.charge_number, key[:, 0].astype(np.int16))
+        self.mass_number = np.append(self.mass_number, key[:, 1].astype(np.int16))
+        self.isomer = np.append(self.isomer, key[:, 2].astype(bool))
+        self.stable = np.append(self.stable, [iso.is_stable for iso in new])
+        self.primordial = np.append(self.primordial, [iso.is_primordial for iso in new])
+        self.symbol = np.append(self.symbol, key[:, 0].astype(np.int16))
+        self.name = np.append(self.name, np.array([str(iso) for iso in new], "U5"))
+        self.ppn_name = np.append(
+            self.ppn_name, np.array([iso.ppn_name for iso in new], "S5")
+        )
+
+
+nuclide_table = NuclideTable()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Partition functions and ground state data of the winvn nuclide table."""
+
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+
+from rates import cache
+from rates.interpolate import LogLogInterpolator
+from rates.nuclides import nuclide_table
+
+# T9 grid of the normalized partition functions in winvn.
+WINVN_TEMPERATURES = np.array(
+    [0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.5]
+    + [2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+)
+# (m_u k T / 2 pi hbar^2)^3/2 / N_A at T9 = 1, mol / cm^3.
+SAHA_CONSTANT = 9.86846e9
+# 1 / k in GK / MeV, Q / kT = T9_PER_MEV * Q / T9.
+T9_PER_MEV = 11.60452
+
+
+class PartitionFunctions:
+    """winvn data of every nuclide, indexed by nuclide_table id.
+
+    Nuclides that are not in the file have a partition function of 1 and
+    are marked in known. The arrays by id are sized to the nuclide_table
+    when the file is loaded, use is_known, mass_excesses and
+    statistical_weights for ids that may have been registered since.
+
+    Parameters
+    ----------
+    file_path : [str, Path]
+
+    Attributes
+    ----------
+    columns : Dict[str, np.ndarray]
+        Output of read_winvn.
+    ids : np.ndarray
+        (R,) nuclide_table id of every row of the file.
+    known : np.ndarray
+        Mask of the nuclide_table ids found in the file.
+    spin : np.ndarray
+        Ground state spin J by nuclide_table id.
+    mass_excess : np.ndarray
+        MeV by nuclide_table id, NaN if not known.
+    log_partition_table : np.ndarray
+        (K, 24) ln of the normalized partition function G on
+        WINVN_TEMPERATURES by nuclide_table id.
+
+    """
+
+    def __init__(self, file_path: Union[str, Path]) -> None:
+        self.file_path = Path(file_path)
+        self.columns = cache.load(self.file_path, read_winvn, "winvn")
+        self.ids = nuclide_table.ids(self.columns["Z"], self.columns["A"])
+
+        # Isomers are listed after their ground state and share its id.
+        ids, rows = np.unique(self.ids, return_index=True)
+        size = len(nuclide_table)
+        self.known = np.zeros(size, dtype=bool)
+        self.known[ids] = True
+        self.spin = np.zeros(size)
+        self.spin[ids] = self.columns["Spin"][rows]
+        self.mass_excess = np.full(size, np.nan)
+        self.mass_excess[ids] = self.columns["MassExcess"][rows]
+        self.log_partition_table = np.zeros((size, len(WINVN_TEMPERATURES)))
+        self.log_partition_table[ids] = np.log(self.columns["G"][rows])
+        self._interpolator = LogLogInterpolator(
+            WINVN_TEMPERATURES, self.log_partition_table, log_y=False
+        )
+
+    def __str__(self) -> str:
+        return self.file_path.stem
+
+    def __len__(self) -> int:
+        return len(self.columns["Z"])
+
+    def log_partitions(self, temp9: Union[float, np.ndarray]) -> np.ndarray:
+        """ln G of every nuclide_table id on a temperature grid.
+
+        ln G is interpolated linearly in ln T9 once for all nuclides, and
+        held at the end values outside of 0.1 - 10 GK.
+
+        Parameters
+        ----------
+        temp9 : [float, np.ndarray]
+            M temperatures in T9.
+
+        Returns
+        -------
+        np.ndarray
+            (len(nuclide_table), M), zero for the nuclides not in the file.
+        """
+        temp9 = np.clip(temp9, WINVN_TEMPERATURES[0], WINVN_TEMPERATURES[-1])
+        log_g = self._interpolator(temp9)
+        missing = len(nuclide_table) - len(log_g)
+        if missing:
+            log_g = np.concatenate((log_g, np.zeros((missing,) + log_g.shape[1:])))
+        return log_g
+
+    def is_known(self, ids: np.ndarray) -> np.ndarray:
+        """Mask of the nuclide_table ids found in the file, False for -1 and
+        for ids registered after it was loaded.
+
+        Parameters
+        ----------
+        ids : np.ndarray
+
+        Returns
+        -------
+        np.ndarray
+        """
+        ids = np.asarray(ids)
+        found = (ids >= 0) & (ids < len(self.known))
+        return found & self.known[np.where(found, ids, 0)]
+
+    def mass_excesses(self, ids: np.ndarray) -> np.ndarray:
+        """Mass excess in MeV of nuclide_table ids, NaN where not known.
+
+        Parameters
+        ----------
+        ids : np.ndarray
+
+        Returns
+        -------
+        np.ndarray
+        """
+        ids = np.asarray(ids)
+        found = self.is_known(ids)
+        return np.where(found, self.mass_excess[np.where(found, ids, 0)], np.nan)
+
+    def statistical_weights(self, ids: np.ndarray) -> np.ndarray:
+        """2J + 1 of nuclide_table ids, NaN where not known.
+
+        Parameters
+        ----------
+        ids : np.ndarray
+
+        Returns
+        -------
+        np.ndarray
+        """
+        ids = np.asarray(ids)
+        found = self.is_known(ids)
+        return np.where(found, 2 * self.spin[np.where(found, ids, 0)] + 1, np.nan)
+
+
+def read_winvn(file_path: Union[str, Path]) -> Dict[str, np.ndarray]:
+    """Reads a winvn partition function table.
+
+    The file holds the temperature grid, the list of names and then one
+    block per nuclide: name, A, Z, N, spin and mass excess (MeV) followed by
+    the normalized partition function at every grid temperature.
+
+    Parameters
+    ----------
+    file_path : [str, Path]
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Name (n,), A (n,), Z (n,), N (n,), Spin (n,), MassExcess (n,) and
+        G (n, 24).
+    """
+    with open(file_path) as winvn_file:
+        lines = [line.split() for line in winvn_file if line.strip()]
+
+    grid: List[float] = []
+    i = 0
+    while i < len(lines) and all(_is_number(token) for token in lines[i]):
+        grid.extend(float(token) for token in lines[i])
+        i += 1
+    # The grid is written in 10^8 or 10^9 K depending on the version, only
+    # its shape is checked.
+    grid = np.array(grid[-len(WINVN_TEMPERATURES) :])
+    if len(grid) != len(WINVN_TEMPERATURES) or not np.allclose(
+        grid / WINVN_TEMPERATURES, grid[0] / WINVN_TEMPERATURES[0], rtol=1e-3
+    ):
+        raise Exception("Unknown winvn temperature grid")
+
+    while i < len(lines) and len(lines[i]) == 1:
+        i += 1
+
+    rows = []
+    partition = []
+    while i < len(lines):
+        if len(lines[i]) != 6:
+            raise Exception("Bad winvn nuclide line: " + " ".join(lines[i]))
+        rows.append(lines[i])
+        i += 1
+        values: List[float] = []
+        while len(values) < len(WINVN_TEMPERATURES):
+            values.extend(float(token) for token in lines[i])
+            i += 1
+        partition.append(values)
+
+    rows = np.array(rows, dtype=str).reshape(-1, 6)
+    return {
+        "Name": rows[:, 0].astype("U5"),
+        "A": np.rint(rows[:, 1].astype(np.float64)).astype(np.int16),
+        "Z": rows[:, 2].astype(np.int16),
+        "N": rows[:, 3].astype(np.int16),
+        "Spin": rows[:, 4].astype(np.float64),
+        "MassExcess": rows[:, 5].astype(np.float64),
+        "G": np.array(partition, dtype=np.float64).reshape(-1, len(WINVN_TEMPERATURES)),
+    }
+
+
+def _is_number(token: str) -> bool:
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Maxwellian averaged n capture cross sections in the ppn input format."""
+
+from pathlib import Path
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from rates import cache
+from rates.isotope import Isotope
+from rates.kadonis_file import TEMPERATURES, Kadonis
+from rates.nuclides import nuclide_table
+from rates.reaction import KadonisReaction
+
+# kT grid of the file in keV, the Kadonis grid without 8 keV.
+MACS_TEMPERATURES = (5, 10, 15, 20, 25, 30, 40, 50, 60, 80, 100)
+MISSING = 99999
+# N_A * 1e-27 cm^2/mb * c * sqrt(2 / (m_u c^2 in keV)), so that
+# N_A <sigma v> = RATE_CONSTANT * MACS * sqrt(kT / mu) with mu in u.
+RATE_CONSTANT = 6.02214076e23 * 1e-27 * 2.99792458e10 * np.sqrt(2 / 931494.10242)
+
+
+class PPNMacs:
+    """MACS of every row of a ppn MACS file, (N, 11) on MACS_TEMPERATURES.
+
+    Parameters
+    ----------
+    file_path : Union[str, Path] = None
+        Path to the file, data/ppn_macs_5.txt if None.
+
+    Attributes
+    ----------
+    columns : Dict[str, np.ndarray]
+        Output of read_ppn_macs.
+    macs : np.ndarray
+        (N, 11) cross sections in mb, NaN where missing.
+    nuclide_ids : np.ndarray
+        (N,) nuclide_table id of the target of every row.
+    index : np.ndarray
+        Row of every nuclide_table id, -1 if not in the file. The first row
+        wins when a nuclide is listed twice.
+
+    """
+
+    def __init__(self, file_path: Union[str, Path] = None) -> None:
+        if file_path is None:
+            file_path = Path(__file__).parent.parent / "data/ppn_macs_5.txt"
+        self.file_path = Path(file_path)
+        self.columns = cache.load(self.file_path, read_ppn_macs, "ppn_macs")
+        self.macs = self.columns["MACS"]
+        self.nuclide_ids = nuclide_table.ids(self.columns["Z"], self.columns["A"])
+
+        self.index = np.full(len(nuclide_table), -1, dtype=np.int64)
+        self.index[self.nuclide_ids[::-1]] = np.arange(len(self))[::-1]
+
+    def __str__(self) -> str:
+        return self.file_path.stem
+
+    def __len__(self) -> int:
+        return len(self.columns["Z"])
+
+    def __getitem__(self, target: Union[str, Isotope]) -> KadonisReaction:
+        (row,), _ = self.rows([target])
+        if row < 0:
+            raise Exception(str(target) + " Not found in file")
+        return KadonisReaction(
+            target=Isotope(self.columns["Z"][row], self.columns["A"][row]),
+            rr=self.rates()[row],
+            err=np.zeros(len(MACS_TEMPERATURES)),
+            temp=MACS_TEMPERATURES,
+            label="ppn MACS",
+        )
+
+    def in_file(self, target: Union[str, Isotope]) -> bool:
+        return bool(self.rows([target])[1][0])
+
+    def rows(
+        self, targets: Union[Sequence[Union[str, Isotope]], np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows of many targets at once.
+
+        Parameters
+        ----------
+        targets : [Sequence[Union[str, Isotope]], np.ndarray]
+            Isotopes or names, or an integer array of nuclide_table ids.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Row of every target, -1 where it is not in the file, and the mask
+            of the targets found.
+        """
+        if isinstance(targets, np.ndarray) and targets.dtype.kind in "iu":
+            ids = targets.astype(np.int64)
+        else:
+            ids = nuclide_table.isotope_ids(targets).astype(np.int64)
+        rows = np.full(ids.shape, -1, dtype=np.int64)
+        inside = (ids >= 0) & (ids < len(self.index))
+        rows[inside] = self.index[ids[inside]]
+        return rows, rows >= 0
+
+    def rates(self) -> np.ndarray:
+        """(N, 11) N_A <sigma v> of every row in cm^3/mol/s, see macs_to_rates."""
+        return macs_to_rates(self.macs, MACS_TEMPERATURES, self.columns["A"])
+
+    def compare(self, kadonis: Kadonis) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Rates of every row over the Kadonis rates of the same target.
+
+        The targets are joined in one lookup into the Kadonis index and only
+        the 11 shared kT columns of the Kadonis rates are used.
+
+        Parameters
+        ----------
+        kadonis : Kadonis
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            Rows of this file with a Kadonis rate, the matching Kadonis rows
+            and the (M, 11) ratios, NaN where either value is missing.
+        """
+        key = np.column_stack(
+            (self.columns["Z"], self.columns["A"], np.zeros(len(self)))
+        ).astype(np.int64)
+        kadonis_rows, found = kadonis.rows(key)
+        rows = np.flatnonzero(found)
+        shared = np.searchsorted(TEMPERATURES, MACS_TEMPERATURES)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = (
+                self.rates()[rows]
+                / kadonis.columns["Rate"][kadonis_rows[rows]][:, shared]
+            )
+        return rows, kadonis_rows[rows], ratio
+
+    def write(self, file_path: Union[str, Path]) -> None:
+        """Writes the table back in the ppn input format.
+
+        Parameters
+        ----------
+        file_path : [str, Path]
+        """
+        write_ppn_macs(file_path, self.columns)
+
+
+def macs_to_rates(
+    macs: np.ndarray, kt: Sequence[float], mass_number: np.ndarray
+) -> np.ndarray:
+    """N_A <sigma v> = N_A MACS v_T of n captures, v_T = sqrt(2 kT / mu).
+
+    Parameters
+    ----------
+    macs : np.ndarray
+        (N, M) cross sections in mb.
+    kt : Sequence[float]
+        (M,) keV.
+    mass_number : np.ndarray
+        (N,) of the targets, the reduced mass being mu = A / (A + 1) u.
+
+    Returns
+    -------
+    np.ndarray
+        (N, M) cm^3/mol/s.
+    """
+    mass_number = np.asarray(mass_number, dtype=np.float64)[:, None]
+    reduced_mass = mass_number / (mass_number + 1)
+    return (
+        RATE_CONSTANT * macs * np.sqrt(np.asarray(kt, dtype=np.float64) / reduced_mass)
+    )
+
+
+def read_ppn_macs(file_path: Union[str, Path]) -> Dict[str, np.ndarray]:
+    """Reads a ppn MACS file into columns.
+
+    The header line holds the kT grid, then every line up to the first blank
+    one is Z, A, symbol, the 11 MACS in mb (99999 when missing), a flag and
+    an optional comment. The references after the table are kept as
+    Notes.
+
+    Parameters
+    ----------
+    file_path : Union[str, Path]
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Z (n,), A (n,), Sym (n,), MACS (n, 11), Flag (n,), Comment (n,),
+        Header and Notes (lines after the table).
+    """
+    with open(file_path, encoding="latin-1") as ppn_file:
+        lines = ppn_file.read().splitlines()
+
+    header = lines[0]
+    grid = header.split("(keV)")[0].split()
+    if tuple(int(temp) for temp in grid) != MACS_TEMPERATURES:
+        raise Exception("Unknown ppn MACS energy grid")
+
+    end = 1
+    while end < len(lines) and lines[end].strip():
+        end += 1
+
+    fields = []
+    comments = []
+    for line in lines[1:end]:
+        data, _, comment = line.partition("!")
+        tokens = data.split()
+        if len(tokens) < len(MACS_TEMPERATURES) + 4:
+            raise Exception("Bad ppn MACS line: " + line)
+        # A few comments are written without the "!".
+        fields.append(tokens[: len(MACS_TEMPERATURES) + 4])
+        comments.append(
+            " ".join(tokens[len(MACS_TEMPERATURES) + 4 :] + comment.split())
+        )
+
+    fields = np.array(fields, dtype=str).reshape(-1, len(MACS_TEMPERATURES) + 4)
+    macs = fields[:, 3:-1].astype(np.float64)
+    macs[macs == MISSING] = np.nan
+    return {
+        "Z": fields[:, 0].astype(np.int16),
+        "A": fields[:, 1].astype(np.int16),
+        "Sym": fields[:, 2].astype("U2"),
+        "MACS": macs,
+        "Flag": fields[:, -1].astype(np.int8),
+        "Comment": np.array(comments, dtype=str),
+        "Header": np.array(header),
+        "Notes": np.array(lines[end + 1 :], dtype=str),
+    }
+
+
+def write_ppn_macs(file_path: Union[str, Path], columns: Dict[str, np.ndarray]) -> None:
+    """Writes columns as read_ppn_macs returns them in the ppn format.
+
+    The values are formatted all at once, with 4 significant figures and
+    the short exponents of the original file.
+
+    Parameters
+    ----------
+    file_path : Union[str, Path]
+    columns : Dict[str, np.ndarray]
+    """
+    macs = np.char.mod("%.3e", np.nan_to_num(columns["MACS"], nan=MISSING))
+    macs = np.char.replace(np.char.replace(macs, "e+0", "e+"), "e-0", "e-")
+    macs[np.isnan(columns["MACS"])] = str(MISSING)
+
+    lines = [
+        "{0}\t{1}\t{2}\t{3} {4}{5}".format(
+            z, a, sym, "\t".join(values), flag, " !" + comment if comment else ""
+        )
+        for z, a, sym, values, flag, comment in zip(
+            columns["Z"].tolist(),
+            columns["A"].tolist(),
+            columns["Sym"].tolist(),
+            macs.tolist(),
+            columns["Flag"].tolist(),
+            columns["Comment"].tolist(),
+        )
+    ]
+
+    with open(file_path, "w", encoding="latin-1") as ppn_file:
+        ppn_file.write(str(columns["Header"]) + "\n")
+        ppn_file.write("\n".join(lines) + "\n\n")
+        if len(columns["Notes"]):
+            ppn_file.write("\n".join(np.asarray(columns["Notes"]).tolist()) + "\n")
@@ -11,19 +11,42 @@ Parameters
 Return
 ------
 """
-import copy
-from typing import Union, List, Iterable, Sequence, Tuple
-from collections import Counter
+from typing import Union, List, Iterable, Sequence, Tuple, Dict, Callable
 
 import numpy as np
 import matplotlib.pyplot as plt
 
+from rates.interpolate import LogLogInterpolator, relative_error
 from rates.isotope import Isotope
-from rates.temperature import Temperature
+from rates.nuclides import nuclide_table
+from rates.temperature import (
+    Temperature,
+    TemperatureGrid,
+    t9_basis,
+    t9_log_derivative,
+)
 
 real = Union[float, int]
 iso_list_type = Iterable[Union[Isotope, str]]
 
+# Number of targets and products in each reaclib chapter.
+CHAPTERS = {
+    1: (1, 1),
+    2: (1, 2),
+    3: (1, 3),
+    4: (2, 1),
+    5: (2, 2),
+    6: (2, 3),
+    7: (2, 4),
+    8: (3, 1),
+    9: (3, 2),
+    10: (4, 2),
+    11: (1, 4),
+}
+_CHAPTER_OF_COUNTS = {counts: chapter for chapter, counts in CHAPTERS.items()}
+# Targets and products held by each side of a reaction key.
+KEY_SPECIES = 4
+
 
 class Reaction:
     """The default reaction class.
@@ -37,12 +60,16 @@ class Reaction:
 
     Attributes
     ----------
+    key : Tuple[int, ...]
+        Canonical key of the reaction, see reaction_key, used for equality
+        and hashing.
     "mpl_plt" : plt.axis axis
     """
 
     def __init__(self, targets: iso_list_type, products: iso_list_type) -> None:
         self.targets = [Isotope.name(t) for t in targets]
         self.products = [Isotope.name(t) for t in products]
+        self.key = reaction_key(self.targets, self.products)
 
     def __str__(self) -> str:
         return "{0} -> {1}".format(
@@ -51,14 +78,49 @@ class Reaction:
         )
 
     def __eq__(self, other: object) -> bool:
-        # if not isinstance(other, Reaction):
-        #    raise NotImplementedError
+        if not isinstance(other, Reaction):
+            return NotImplemented
+        return self.key == other.key
 
-        return Counter([str(i) for i in self.targets]) == Counter(
-            [str(i) for i in other.targets]
-        ) and Counter([str(i) for i in self.products]) == Counter(
-            [str(i) for i in other.products]
-        )
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    # Natural log of the rate, defined by the rate classes only.
+    log_rate: Callable[..., np.ndarray]
+
+    def log_ratio(
+        self, other: "Reaction", temp: Union[real, np.ndarray, Temperature]
+    ) -> np.ndarray:
+        """ln(rate / other rate), taken as a difference of log rates.
+
+        Parameters
+        ----------
+        other : Reaction
+        temp : [float, np.ndarray, Temperature]
+            Pass a Temperature when the reactions use different temperature
+            units, e.g. Reaclib (T9) and Kadonis (keV).
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return self.log_rate(temp) - other.log_rate(temp)
+
+    def ratio(
+        self, other: "Reaction", temp: Union[real, np.ndarray, Temperature]
+    ) -> np.ndarray:
+        """rate / other rate, finite even where both rates overflow.
+
+        Parameters
+        ----------
+        other : Reaction
+        temp : [float, np.ndarray, Temperature]
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return np.exp(self.log_ratio(other, temp))
 
     def mpl_plot(
         self, ax: plt.axis = None, temp_unit: str = "GK", **kwargs
@@ -109,6 +171,8 @@ class ReaclibReaction(Reaction):
     reaclib_factory
     """
 
+    chapters = CHAPTERS
+
     def __init__(
         self,
         targets: iso_list_type,
@@ -122,28 +186,59 @@ class ReaclibReaction(Reaction):
         self.label = label
         self.color = color
 
-    def rate(self, temp9: Union[real, np.asarray]):
+    def rate(self, temp9: Union[real, np.ndarray, Temperature]):
         """
 
         Parameters
         ----------
-        temp9 : float
-            Temperature of reaction in T9
+        temp9 : [float, np.ndarray, Temperature]
+            Temperature of reaction in T9, a TemperatureGrid reuses its
+            precomputed power basis.
 
         Returns
         -------
         float
 
         """
-        return np.exp(
-            self.a[0]
-            + self.a[1] * temp9 ** ((2.0 * 1 - 5.0) / 3.0)
-            + self.a[2] * temp9 ** ((2.0 * 2 - 5.0) / 3.0)
-            + self.a[3] * temp9 ** ((2.0 * 3 - 5.0) / 3.0)
-            + self.a[4] * temp9 ** ((2.0 * 4 - 5.0) / 3.0)
-            + self.a[5] * temp9 ** ((2.0 * 5 - 5.0) / 3.0)
-            + self.a[6] * np.log(temp9)
-        )
+        return np.exp(self.log_rate(temp9))
+
+    def log_rate(self, temp9: Union[real, np.ndarray, Temperature]) -> np.ndarray:
+        """Natural log of the rate, the reaclib exponent itself.
+
+        Parameters
+        ----------
+        temp9 : [float, np.ndarray, Temperature]
+            Temperature of reaction in T9.
+
+        Returns
+        -------
+        np.ndarray
+            Finite where rate overflows to inf or underflows to 0.
+        """
+        return np.tensordot(np.asarray(self.a, dtype=float), t9_basis(temp9), 1)
+
+    def rate_and_derivative(
+        self, temp9: Union[real, np.ndarray, Temperature]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rate and its logarithmic temperature derivative d ln(rate) / d ln(T9).
+
+        Both come from the same T9 power basis, see t9_log_derivative.
+
+        Parameters
+        ----------
+        temp9 : [float, np.ndarray, Temperature]
+            Temperature of reaction in T9.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Rate and derivative, each of the shape of temp9.
+
+        """
+        a = np.asarray(self.a, dtype=float)
+        result = np.tensordot(np.stack((a, t9_log_derivative(a))), t9_basis(temp9), 1)
+        np.exp(result[0:1], out=result[0:1])
+        return result[0], result[1]
 
     def mpl_plot(
         self, ax: plt.axis = None, temp_unit: str = "GK", **kwargs
@@ -151,10 +246,10 @@ class ReaclibReaction(Reaction):
 
         ax = ax or plt.gca()
 
-        t = np.logspace(-2, 1, 1000)
+        t = TemperatureGrid.logspace(-2, 1, 1000)
         if temp_unit is "GK":
             ax.loglog(
-                t,
+                t.gk,
                 self.rate(t),
                 color=self.color,
                 label="Reaclib-" + self.label + " " + self.__str__(),
@@ -162,7 +257,7 @@ class ReaclibReaction(Reaction):
             )
         elif temp_unit is "KeV":
             ax.loglog(
-                Temperature(t).kev,
+                t.kev,
                 self.rate(t),
                 color=self.color,
                 label=self.label + " " + self.__str__(),
@@ -197,32 +292,122 @@ class ReaclibReaction(Reaction):
         -------
 
         """
-        if chapter is 1:
-            reaclib_reaction = cls([ei[0]], [ei[1]], a_rates, label)
-        elif chapter is 2:
-            reaclib_reaction = cls([ei[0]], ei[1:3], a_rates, label)
-        elif chapter is 3:
-            reaclib_reaction = cls([ei[0]], ei[1:4], a_rates, label)
-        elif chapter is 4:
-            reaclib_reaction = cls(ei[0:2], [ei[2]], a_rates, label)
-        elif chapter is 5:
-            reaclib_reaction = cls(ei[0:2], ei[2:4], a_rates, label)
-        elif chapter is 6:
-            reaclib_reaction = cls(ei[0:2], ei[2:5], a_rates, label)
-        elif chapter is 7:
-            reaclib_reaction = cls(ei[0:2], ei[2:6], a_rates, label)
-        elif chapter is 8:
-            reaclib_reaction = cls(ei[0:3], [ei[3]], a_rates, label)
-        elif chapter is 9:
-            reaclib_reaction = cls(ei[0:3], ei[3:5], a_rates, label)
-        elif chapter is 10:
-            reaclib_reaction = cls(ei[0:4], ei[4:6], a_rates, label)
-        elif chapter is 11:
-            reaclib_reaction = cls([ei[0]], ei[1:5], a_rates, label)
-        else:
-            raise Exception
-
-        return reaclib_reaction
+        try:
+            n_targets, n_products = cls.chapters[chapter]
+        except KeyError:
+            raise Exception("Chapter {0} is not a reaclib chapter".format(chapter))
+
+        return cls(
+            ei[0:n_targets], ei[n_targets : n_targets + n_products], a_rates, label
+        )
+
+
+class SummedReaclibReaction(ReaclibReaction):
+    """Physical reaction made of several reaclib sets whose rates add up.
+
+    Reaclib splits many reactions into sets, e.g. a resonant and a
+    non-resonant part, the rate of the reaction is the sum of their rates.
+
+    Parameters
+    ----------
+    sets : Sequence[ReaclibReaction]
+        Sets of the same reaction.
+    rows : np.ndarray
+        Rows of the sets in the file they come from.
+    color : str
+        Colour to use for plots
+
+    Attributes
+    ----------
+    sets
+    rows
+    rate
+    """
+
+    def __init__(
+        self,
+        sets: Sequence[ReaclibReaction],
+        rows: np.ndarray = None,
+        color: str = "C1",
+    ) -> None:
+        if any(s != sets[0] for s in sets[1:]):
+            raise Exception("Sets are from different reactions")
+
+        labels: List[str] = []
+        for s in sets:
+            if s.label not in labels:
+                labels.append(s.label)
+
+        super().__init__(
+            sets[0].targets,
+            sets[0].products,
+            a_rates=np.array([s.a for s in sets], dtype=float).reshape(-1, 7),
+            label="+".join(labels),
+            color=color,
+        )
+        self.sets = list(sets)
+        self.rows = rows
+
+    def rate(self, temp9: Union[real, np.ndarray, Temperature]):
+        """Sum of the rates of all sets.
+
+        The exponents of all sets are evaluated together and combined with
+        log-sum-exp, so large exponents do not overflow before summing.
+
+        Parameters
+        ----------
+        temp9 : [float, np.ndarray, Temperature]
+            Temperature of reaction in T9, a TemperatureGrid reuses its
+            precomputed power basis.
+
+        Returns
+        -------
+        float
+
+        """
+        return np.exp(self.log_rate(temp9))
+
+    def log_rate(self, temp9: Union[real, np.ndarray, Temperature]) -> np.ndarray:
+        """Natural log of the summed rate, a log-sum-exp of the set exponents.
+
+        Parameters
+        ----------
+        temp9 : [float, np.ndarray, Temperature]
+            Temperature of reaction in T9.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        exponent = np.tensordot(self.a, t9_basis(temp9), 1)
+        return np.logaddexp.reduce(exponent, axis=0)
+
+    def rate_and_derivative(
+        self, temp9: Union[real, np.ndarray, Temperature]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Summed rate and its derivative d ln(rate) / d ln(T9).
+
+        The derivative of the sum is the mean of the set derivatives weighted
+        by the set rates.
+
+        Parameters
+        ----------
+        temp9 : [float, np.ndarray, Temperature]
+            Temperature of reaction in T9.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Rate and derivative, each of the shape of temp9.
+
+        """
+        a = np.asarray(self.a, dtype=float)
+        exponent, derivative = np.tensordot(
+            np.stack((a, t9_log_derivative(a))), t9_basis(temp9), 1
+        )
+        log_rate = np.logaddexp.reduce(exponent, axis=0)
+        weight = np.exp(exponent - log_rate)
+        return np.exp(log_rate), np.sum(weight * derivative, axis=0)
 
 
 class KadonisReaction(Reaction):
@@ -254,8 +439,8 @@ class KadonisReaction(Reaction):
         label: str = "Kadonis",
         colour: str = "C2",
     ):
-        product = copy.deepcopy(Isotope.name(target))
-        product.mass_number += 1
+        target = Isotope.name(target)
+        product = Isotope(target.charge_number, target.mass_number + 1)
         super().__init__(["n", target], [product])
 
         self.rr = rr
@@ -264,34 +449,122 @@ class KadonisReaction(Reaction):
         self.temp_unit = temp_units
         self.label = label
         self.colour = colour
+        self._interpolators: Dict[Tuple[str, bool], LogLogInterpolator] = {}
 
-    def rate(self, temp: real) -> float:
+    def rate(
+        self,
+        temp: Union[real, np.ndarray, Temperature],
+        scheme: str = "linear",
+        extrapolate: bool = False,
+    ) -> Union[float, np.ndarray]:
+        """Rate interpolated in log-log space between the tabulated values.
+
+        Parameters
+        ----------
+        temp : [float, np.ndarray, Temperature]
+            Temperature to return rate for, in temp_units unless given as a
+            Temperature.
+        scheme : str {"linear", "cubic"}
+            Interpolation between the tabulated temperatures, see
+            LogLogInterpolator.
+        extrapolate : bool
+            Continue the end segments outside of the tabulated temperatures,
+            else the rate is NaN there.
+
+        Returns
+        -------
+        [float, np.ndarray]
+            Exactly the tabulated value at a tabulated temperature.
         """
+        rate = self.interpolator(scheme, extrapolate)(self._temp(temp))
+        return rate if np.ndim(rate) else float(rate)
+
+    def log_rate(
+        self,
+        temp: Union[real, np.ndarray, Temperature],
+        scheme: str = "linear",
+        extrapolate: bool = False,
+    ) -> Union[float, np.ndarray]:
+        """Natural log of the rate, interpolated directly in log-log space.
 
         Parameters
         ----------
-        temp :
-            Temperature to return rate for
+        temp : [float, np.ndarray, Temperature]
+            Temperature in temp_units unless given as a Temperature.
+        scheme : str {"linear", "cubic"}
+        extrapolate : bool
 
         Returns
         -------
-        float
+        [float, np.ndarray]
         """
-        return self.rr[self.temperature.index(temp)]
+        log_rate = self.interpolator(scheme, extrapolate).log(self._temp(temp))
+        return log_rate if np.ndim(log_rate) else float(log_rate)
+
+    def error(
+        self,
+        temp: Union[real, np.ndarray, Temperature],
+        scheme: str = "linear",
+        extrapolate: bool = False,
+    ) -> Union[float, np.ndarray]:
+        """Error of the rate, the relative error is interpolated linearly in
+        log temperature.
 
-    def error(self, temp: real) -> float:
+        Parameters
+        ----------
+        temp : [float, np.ndarray, Temperature]
+            Temperature to return error for, in temp_units unless given as a
+            Temperature.
+        scheme : str {"linear", "cubic"}
+            Interpolation of the rate, see rate.
+        extrapolate : bool
+
+        Returns
+        -------
+        [float, np.ndarray]
         """
+        temp = self._temp(temp)
+        error = self.interpolator("error", extrapolate)(temp) * self.rate(
+            temp, scheme, extrapolate
+        )
+        return error if np.ndim(error) else float(error)
+
+    def interpolator(
+        self, scheme: str = "linear", extrapolate: bool = False
+    ) -> LogLogInterpolator:
+        """Interpolator of rr, or of the relative error for scheme "error",
+        built once per reaction and scheme.
 
         Parameters
         ----------
-        temp :
-            Temperature to return error for
+        scheme : str {"linear", "cubic", "error"}
+        extrapolate : bool
 
         Returns
         -------
-        float
+        LogLogInterpolator
         """
-        return self.err[self.temperature.index(temp)]
+        key = (scheme, extrapolate)
+        if key not in self._interpolators:
+            if scheme == "error":
+                self._interpolators[key] = LogLogInterpolator(
+                    self.temperature,
+                    relative_error(self.rr, self.err),
+                    extrapolate=extrapolate,
+                    log_y=False,
+                )
+            else:
+                self._interpolators[key] = LogLogInterpolator(
+                    self.temperature, self.rr, scheme, extrapolate
+                )
+        return self._interpolators[key]
+
+    def _temp(
+        self, temp: Union[real, np.ndarray, Temperature]
+    ) -> Union[real, np.ndarray]:
+        if isinstance(temp, Temperature):
+            return temp.kev if self.temp_unit == "KeV" else temp.gk
+        return temp
 
     def diff(self, rate: "KadonisReaction") -> "KadonisReaction":
         """Difference between two reactions
@@ -363,3 +636,100 @@ class KadonisReaction(Reaction):
         ax = super().mpl_plot(ax, temp_unit=temp_unit)
 
         return ax
+
+
+def reaction_key(
+    targets: Iterable[Union[Isotope, str]], products: Iterable[Union[Isotope, str]]
+) -> Tuple[int, ...]:
+    """Canonical, order independent key of a reaction.
+
+    The reaclib chapter implied by the number of targets and products (0 if
+    there is none), then the sorted nuclide_table ids of the targets and of
+    the products, each side padded with -1 to KEY_SPECIES. This is one row
+    of reaction_keys.
+
+    Parameters
+    ----------
+    targets : Iterable[Union[Isotope, str]]
+    products : Iterable[Union[Isotope, str]]
+
+    Returns
+    -------
+    Tuple[int, ...]
+
+    """
+    targets = sorted(nuclide_table.id(t) for t in targets)
+    products = sorted(nuclide_table.id(p) for p in products)
+    chapter = _CHAPTER_OF_COUNTS.get((len(targets), len(products)), 0)
+    return (
+        (chapter,)
+        + tuple(targets)
+        + (-1,) * (KEY_SPECIES - len(targets))
+        + tuple(products)
+        + (-1,) * (KEY_SPECIES - len(products))
+    )
+
+
+def reaction_keys(targets: np.ndarray, products: np.ndarray) -> np.ndarray:
+    """Canonical keys of many reactions at once, see reaction_key.
+
+    Parameters
+    ----------
+    targets : np.ndarray
+        (N, T) nuclide_table ids of the targets, -1 for none, T <= 4.
+    products : np.ndarray
+        (N, P) nuclide_table ids of the products, -1 for none, P <= 4.
+
+    Returns
+    -------
+    np.ndarray
+        (N, 9) int64 keys, row i equals reaction_key of reaction i.
+
+    """
+    sides = []
+    for ids in (targets, products):
+        ids = np.asarray(ids, dtype=np.int64)
+        ids = ids.reshape(len(ids), -1) if ids.ndim != 2 else ids
+        padded = np.full((len(ids), KEY_SPECIES), np.iinfo(np.int64).max)
+        padded[:, : ids.shape[1]] = np.where(ids < 0, padded[:, : ids.shape[1]], ids)
+        padded.sort(axis=1)
+        padded[padded == np.iinfo(np.int64).max] = -1
+        sides.append(padded)
+
+    chapter_table = np.zeros((KEY_SPECIES + 1, KEY_SPECIES + 1), dtype=np.int64)
+    for chapter, (n_targets, n_products) in CHAPTERS.items():
+        chapter_table[n_targets, n_products] = chapter
+    chapter = chapter_table[(sides[0] >= 0).sum(axis=1), (sides[1] >= 0).sum(axis=1)]
+    return np.column_stack([chapter] + sides)
+
+
+def join_reaction_keys(
+    left: np.ndarray, right: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Hash join of two arrays of reaction keys.
+
+    Parameters
+    ----------
+    left : np.ndarray
+        (N, 9) keys, e.g. Kadonis.keys.
+    right : np.ndarray
+        (M, 9) keys, e.g. Reaclib.keys.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Rows of left and rows of right of every matching pair, ordered by
+        left row then right row.
+
+    """
+    rows: Dict[Tuple[int, ...], List[int]] = {}
+    for row, key in enumerate(map(tuple, np.asarray(right).tolist())):
+        rows.setdefault(key, []).append(row)
+
+    left_rows: List[int] = []
+    right_rows: List[int] = []
+    for row, key in enumerate(map(tuple, np.asarray(left).tolist())):
+        matches = rows.get(key, ())
+        left_rows.extend([row] * len(matches))
+        right_rows.extend(matches)
+    return np.array(left_rows, dtype=np.int64), np.array(right_rows, dtype=np.int64)
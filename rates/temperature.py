@@ -11,6 +11,7 @@ Parameters
 Return
 ------
 """
+from functools import lru_cache
 from numbers import Real
 from typing import Union
 
@@ -68,3 +69,130 @@ class Temperature:
         elif self._kev is not None:
             pass
         return self._kev
+
+
+class TemperatureGrid(Temperature):
+    """Fixed temperatures shared by many rate evaluations.
+
+    The grid is read only, so the T9 power basis used by the Reaclib rates is
+    computed once and reused by every rate() it is passed to. Grids made with
+    logspace are cached by their parameters.
+
+    Attributes
+    ----------
+    gk : numpy.array
+        Temperatures in units of 'Gk'.
+    kev : numpy.array
+        Temperatures in units of 'KeV'.
+    basis : numpy.array
+        (7, M) T9 power basis, see t9_basis.
+
+    """
+
+    def __init__(self, temperature: numpy.array, unit: str = "Gk") -> None:
+        """
+
+        Parameters
+        ----------
+        temperature : numpy.array
+            the temperatures of the grid.
+        unit : str {"Gk", "KeV"}
+
+        """
+        temperature = numpy.array(temperature, dtype=numpy.float64, ndmin=1)
+        super().__init__(temperature, unit)
+        self.gk.flags.writeable = False
+        self.kev.flags.writeable = False
+        self._basis: Union[numpy.array, None] = None
+
+    def __len__(self) -> int:
+        return len(self.gk)
+
+    @property
+    def basis(self) -> numpy.array:
+        """T9 power basis of the grid, computed on first use.
+
+        Returns
+        -------
+        numpy.array
+        """
+        if self._basis is None:
+            self._basis = t9_basis(self.gk)
+            self._basis.flags.writeable = False
+        return self._basis
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def logspace(
+        cls, start: Real = -2, stop: Real = 1, num: int = 1000, unit: str = "Gk"
+    ) -> "TemperatureGrid":
+        """Cached grid of num temperatures from 10**start to 10**stop.
+
+        Parameters
+        ----------
+        start : Real
+        stop : Real
+        num : int
+        unit : str {"Gk", "KeV"}
+
+        Returns
+        -------
+        TemperatureGrid
+        """
+        return cls(numpy.logspace(start, stop, num), unit=unit)
+
+
+def t9_basis(
+    temp9: Union[Real, numpy.ndarray, Temperature, TemperatureGrid]
+) -> numpy.ndarray:
+    """Powers of T9 that the seven Reaclib parameters multiply.
+
+    Parameters
+    ----------
+    temp9 : [Real, numpy.array, Temperature, TemperatureGrid]
+        Temperature(s) in units of 'Gk', the precomputed basis of a
+        TemperatureGrid is returned as is.
+
+    Returns
+    -------
+    numpy.array
+        Array of shape (7,) + shape of temp9 holding 1, T9^-1, T9^-1/3,
+        T9^1/3, T9, T9^5/3 and ln(T9).
+    """
+    if isinstance(temp9, TemperatureGrid):
+        return temp9.basis
+    if isinstance(temp9, Temperature):
+        temp9 = temp9.gk
+
+    temp9 = numpy.asarray(temp9, dtype=numpy.float64)
+    basis = numpy.empty((7,) + temp9.shape)
+    basis[0] = 1.0
+    for i in range(1, 6):
+        basis[i] = temp9 ** ((2.0 * i - 5.0) / 3.0)
+    basis[6] = numpy.log(temp9)
+    return basis
+
+
+def t9_log_derivative(a_rates: numpy.ndarray) -> numpy.ndarray:
+    """Parameters whose product with t9_basis is d ln(rate) / d ln(T9).
+
+    With ln(rate) = a0 + sum_i a_i T9^p_i + a6 ln(T9) the derivative is
+    a6 + sum_i p_i a_i T9^p_i, which is again a combination of the same
+    basis, so rates and derivatives can share a single basis evaluation.
+
+    Parameters
+    ----------
+    a_rates : numpy.array
+        (..., 7) Reaclib parameters a0..a6.
+
+    Returns
+    -------
+    numpy.array
+        (..., 7) parameters of the derivative.
+    """
+    a_rates = numpy.asarray(a_rates, dtype=numpy.float64)
+    derivative = numpy.zeros_like(a_rates)
+    derivative[..., 0] = a_rates[..., 6]
+    for i in range(1, 6):
+        derivative[..., i] = a_rates[..., i] * (2.0 * i - 5.0) / 3.0
+    return derivative
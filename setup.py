@@ -17,7 +17,14 @@ from setuptools import setup, find_packages
 with open("README.md") as readme_file:
     readme = readme_file.read()
 
-requirements = ["pandas", "matplotlib", "numpy", "requests", "beautifulsoup4"]
+requirements = [
+    "pandas",
+    "matplotlib",
+    "numpy",
+    "scipy",
+    "requests",
+    "beautifulsoup4",
+]
 
 setup(
     name="rates",
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Fixtures shared by the tests."""
+import numpy as np
+import pytest
+
+from rates.reaclib_file import Reaclib
+
+
+@pytest.fixture
+def reaclib_sets():
+    """Builds a Reaclib from a list of (chapter, species) sets.
+
+    The sets are labelled "test" with no Q values, rates gives their
+    temperature independent rates, a0 = ln(rate), and all the parameters
+    are 0 if it is None.
+    """
+
+    def build(sets, rates=None):
+        species = np.full((len(sets), 6), "", dtype="U5")
+        for row, (_, names) in enumerate(sets):
+            species[row, : len(names)] = names
+        coefficients = np.zeros((len(sets), 7))
+        if rates is not None:
+            coefficients[:, 0] = np.log(rates)
+        return Reaclib.from_columns(
+            {
+                "Chapter": np.array([chapter for chapter, _ in sets]),
+                "Species": species,
+                "SetLabel": np.full(len(sets), "test"),
+                "RateType": np.full(len(sets), ""),
+                "ReverseRate": np.full(len(sets), ""),
+                "QValue": np.zeros(len(sets)),
+                "Rate": coefficients,
+            }
+        )
+
+    return build
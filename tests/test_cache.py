@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Tests of rates.cache."""
+import numpy as np
+
+from rates import cache
+
+columns = {
+    "Chapter": np.array([1, 4, 4]),
+    "Species": np.array([["n", "p"], ["n", "c12"], ["he4", "c12"]]),
+    "Rate": np.arange(21, dtype=np.float64).reshape(3, 7),
+    "Version": np.array(1.0),
+}
+
+
+class Reader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, file_path):
+        self.calls += 1
+        return columns
+
+
+def test_write_read(tmp_path):
+    key = {"sha256": "0", "size": 0}
+    cache.write(tmp_path / "file.cache", key, columns)
+    read = cache.read(tmp_path / "file.cache", key)
+
+    assert list(read) == list(columns)
+    for name, array in columns.items():
+        assert read[name].dtype == array.dtype
+        assert read[name].shape == array.shape
+        assert np.array_equal(read[name], array)
+    assert isinstance(read["Rate"], np.memmap)
+
+    read["Rate"][0, 0] += 1
+    assert (
+        cache.read(tmp_path / "file.cache", key)["Rate"][0, 0] == columns["Rate"][0, 0]
+    )
+
+    assert cache.read(tmp_path / "file.cache", {"sha256": "1", "size": 0}) is None
+    assert cache.read(tmp_path / "missing.cache", key) is None
+
+
+def test_load_uses_cache(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("source")
+    reader = Reader()
+
+    cache.load(source, reader, "test")
+    assert (tmp_path / "source.cache").is_file()
+    loaded = cache.load(source, reader, "test")
+
+    assert reader.calls == 1
+    assert np.array_equal(loaded["Rate"], columns["Rate"])
+
+
+def test_load_rebuilds_stale(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("source")
+    reader = Reader()
+
+    cache.load(source, reader, "test")
+    source.write_text("changed")
+    cache.load(source, reader, "test")
+    assert reader.calls == 2
+
+    cache.load(source, reader, "other reader")
+    assert reader.calls == 3
+
+    (tmp_path / "source.cache").write_bytes(b"corrupt")
+    cache.load(source, reader, "other reader")
+    assert reader.calls == 4
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Tests of rates.integrate."""
+import numpy as np
+import pytest
+
+from rates.integrate import NetworkIntegrator
+
+ni56_decay = np.log(2) / (6.075 * 86400)
+co56_decay = np.log(2) / (77.24 * 86400)
+
+
+@pytest.fixture
+def decay_chain(reaclib_sets):
+    return NetworkIntegrator(
+        reaclib_sets(
+            [(1, ["ni56", "co56"]), (1, ["co56", "fe56"])], [ni56_decay, co56_decay]
+        )
+    )
+
+
+@pytest.fixture
+def burning(reaclib_sets):
+    return NetworkIntegrator(
+        reaclib_sets(
+            [
+                (4, ["p", "p", "d"]),
+                (5, ["d", "d", "n", "he3"]),
+                (8, ["he4", "he4", "he4", "c12"]),
+                (4, ["he4", "c12", "o16"]),
+            ],
+            [1e-2, 1e-1, 1e-3, 1e-2],
+        )
+    )
+
+
+class TestNetworkIntegrator:
+    def test_coefficients(self, burning):
+        coefficients = burning.coefficients(1.0, 10.0)
+        assert np.allclose(
+            coefficients, [1e-2 * 10 / 2, 1e-1 * 10 / 2, 1e-3 * 100 / 6, 1e-1]
+        )
+
+    def test_rhs(self, burning):
+        y = burning.abundances({"p": 0.5, "d": 0.01, "he4": 0.1, "c12": 0.001})
+        dydt = burning.rhs(y, burning.coefficients(1.0, 10.0))
+        (p, d, he4) = burning.graph.node(["p", "d", "he4"])
+
+        pp = 1e-2 * 10 / 2 * 0.5 ** 2
+        dd = 1e-1 * 10 / 2 * 0.01 ** 2
+        assert dydt[p] == pytest.approx(-2 * pp)
+        assert dydt[d] == pytest.approx(pp - 2 * dd)
+        assert dydt[he4] == pytest.approx(-3 * 1e-3 * 100 / 6 * 0.1 ** 3 - 1e-5)
+        assert np.sum(burning.mass_fractions(dydt)) == pytest.approx(0.0, abs=1e-12)
+
+    def test_jacobian(self, burning):
+        y = burning.abundances({"p": 0.5, "d": 0.01, "he4": 0.1, "c12": 0.001})
+        coefficients = burning.coefficients(1.0, 10.0)
+        jacobian = burning.jacobian(y, coefficients).toarray()
+
+        step = 1e-7
+        numerical = np.empty_like(jacobian)
+        for node in range(len(burning)):
+            dy = np.zeros(len(burning))
+            dy[node] = step
+            numerical[:, node] = (
+                burning.rhs(y + dy, coefficients) - burning.rhs(y - dy, coefficients)
+            ) / (2 * step)
+        assert np.allclose(jacobian, numerical, rtol=1e-6, atol=1e-12)
+
+    def test_bateman(self, decay_chain):
+        times = np.linspace(0, 200, 21)[1:] * 86400
+        time, y = decay_chain.integrate(
+            {"ni56": 1 / 56}, times[-1], 1.0, 1.0, output_times=times, max_change=0.01
+        )
+        ni56, co56, fe56 = decay_chain.graph.node(["ni56", "co56", "fe56"])
+
+        assert np.allclose(time[1:], times)
+        ni56_exact = np.exp(-ni56_decay * time) / 56
+        co56_exact = (
+            ni56_decay
+            / (co56_decay - ni56_decay)
+            * (np.exp(-ni56_decay * time) - np.exp(-co56_decay * time))
+            / 56
+        )
+        # Backward Euler is first order, 1% changes per step keep it within
+        # 0.1% of the initial abundance.
+        assert np.allclose(y[:, ni56], ni56_exact, rtol=0, atol=1e-3 / 56)
+        assert np.allclose(y[:, co56], co56_exact, rtol=0, atol=1e-3 / 56)
+        assert np.allclose(
+            y[:, fe56], 1 / 56 - ni56_exact - co56_exact, rtol=0, atol=1e-3 / 56
+        )
+        assert np.allclose(decay_chain.mass_fractions(y).sum(axis=1), 1.0)
+
+    def test_two_body(self, reaclib_sets):
+        network = NetworkIntegrator(reaclib_sets([(4, ["p", "p", "d"])], [1e-2]))
+        time, y = network.integrate(
+            {"p": 1.0},
+            1e4,
+            2.0,
+            (np.array([0.0, 1e4]), np.array([10.0, 10.0])),
+            max_change=0.01,
+        )
+        (p,) = network.graph.node(["p"])
+
+        assert time[0] == 0 and time[-1] == 1e4
+        assert np.all(np.diff(time) > 0)
+        assert np.allclose(y[:, p], 1 / (1 + 1e-2 * 10 * time), rtol=1e-2)
+
+    def test_abundances(self, decay_chain):
+        y = decay_chain.abundances({"co56": 0.5})
+        assert y.sum() == 0.5
+        assert y[decay_chain.graph.node("co56")] == 0.5
+        with pytest.raises(Exception):
+            decay_chain.abundances({"fe54": 0.5})
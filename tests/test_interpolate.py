@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Tests of rates.interpolate."""
+import numpy as np
+import pytest
+
+from rates.interpolate import LogLogInterpolator, relative_error
+
+x = np.array([5, 8, 10, 15, 20, 25, 30, 40, 50, 60, 80, 100], dtype=np.float64)
+y = np.array([x ** 2, 1 / x, np.exp(np.sin(x))])
+
+
+class TestLogLogInterpolator:
+    @pytest.mark.parametrize("scheme", ["linear", "cubic"])
+    def test_nodes(self, scheme):
+        assert np.array_equal(LogLogInterpolator(x, y, scheme)(x), y)
+
+    @pytest.mark.parametrize("scheme", ["linear", "cubic"])
+    def test_power_law(self, scheme):
+        temp = np.geomspace(5, 100, 50)
+        rates = LogLogInterpolator(x, y[:2], scheme)(temp)
+
+        assert rates.shape == (2, 50)
+        assert np.allclose(rates, [temp ** 2, 1 / temp])
+
+    def test_cubic_monotone(self):
+        steps = np.array([1, 2, 3, 3, 3, 4, 10, 10, 11, 12, 13, 13], dtype=float)
+        rates = LogLogInterpolator(x, steps, "cubic")(np.geomspace(5, 100, 500))
+
+        assert np.all(np.diff(rates) >= 0)
+        assert rates.min() == 1 and rates.max() == 13
+
+    def test_scalar(self):
+        rate = LogLogInterpolator(x, y[0])(12)
+        assert np.ndim(rate) == 0
+        assert rate == pytest.approx(144)
+
+    def test_out_of_range(self):
+        assert np.all(np.isnan(LogLogInterpolator(x, y)([1, 200])))
+        assert np.allclose(
+            LogLogInterpolator(x, y[0], extrapolate=True)([1, 200]), [1, 40000]
+        )
+
+    def test_missing(self):
+        rates = LogLogInterpolator(x, np.where(x == 30, np.nan, x))([20, 28, 35, 80])
+        assert rates[0] == pytest.approx(20) and rates[3] == pytest.approx(80)
+        assert np.all(np.isnan(rates[1:3]))
+
+    def test_log(self):
+        temp = np.geomspace(5, 100, 50)
+        assert np.allclose(
+            LogLogInterpolator(x, y[0], "cubic").log(temp), 2 * np.log(temp)
+        )
+
+    def test_scheme_error(self):
+        with pytest.raises(Exception):
+            LogLogInterpolator(x, y, "quadratic")
+
+
+def test_relative_error():
+    assert np.array_equal(
+        relative_error([2.0, 0.0, np.nan], [1.0, 0.0, 0.0]), [0.5, 0.0, 0.0]
+    )
@@ -11,6 +11,10 @@ Parameters
 Return
 ------
 """
+import copy
+import pickle
+
+import numpy as np
 import pytest
 
 from rates.isotope import Isotope
@@ -108,3 +112,109 @@ class TestIsotope:
 
     def test_decay_isotope(self):
         assert Isotope.decay_isotope(10, 10) == (5, 10, False)
+
+    def test_interned(self):
+        assert Isotope(6, 12) is Isotope(6.0, 12) is Isotope.name("C12")
+        assert Isotope(6, 12) is not Isotope(6, 12, True)
+        assert Isotope.name("c12") is Isotope.name("12C")
+
+    def test_hash(self):
+        assert len({Isotope(6, 12), Isotope.name("C12"), Isotope(6, 12, True)}) == 2
+        assert {Isotope(1, 1): "p"}[Isotope.name("p")] == "p"
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            Isotope(6, 12).mass_number = 13
+        with pytest.raises(AttributeError):
+            Isotope(6, 12).spin = 0
+
+    def test_copy(self):
+        isotope = Isotope(73, 180, True)
+        assert copy.copy(isotope) is isotope
+        assert copy.deepcopy(isotope) is isotope
+        assert pickle.loads(pickle.dumps(isotope)) is isotope
+
+    def test_decay_new_object(self):
+        isotope = Isotope(9, 26)
+        assert isotope.decay() is Isotope(12, 26)
+        assert isotope.numbers() == (9, 26)
+
+    def test_decay_no_isobar(self):
+        with pytest.raises(ValueError):
+            Isotope(2, 5).decay()
+
+    def test_decay_isotope_array(self):
+        charge, mass, isomer = Isotope.decay_isotope(
+            np.array([9, 14, 4, 20, 2]), np.array([26, 26, 8, 36, 4])
+        )
+        assert charge.tolist() == [12, 12, 2, 16, 2]
+        assert mass.tolist() == [26, 26, 4, 36, 4]
+        assert not isomer.any()
+
+        with pytest.raises(ValueError):
+            Isotope.decay_isotope(np.array([2, 2]), np.array([4, 5]))
+
+    def test_decay_abundances(self):
+        abundance = np.array([[1.0, 2.0], [1.0, 1.0], [3.0, 3.0], [5.0, 5.0]])
+        decayed = Isotope.decay_abundances([9, 14, 4, 26], [26, 26, 8, 56], abundance)
+
+        assert decayed.shape == (119, 351, 2)
+        assert decayed[12, 26].tolist() == [2.0, 3.0]
+        assert decayed[2, 4].tolist() == [3.0, 3.0]
+        assert decayed[26, 56].tolist() == [5.0, 5.0]
+        assert decayed.sum(axis=(0, 1)).tolist() == abundance.sum(axis=0).tolist()
+
+    def test_ppn_names_to_numbers(self):
+        charge, mass, isomer = Isotope.ppn_names_to_numbers(
+            np.array(self.ppn_outputs + ["NE 10", "U 235", "CD*15"])
+        )
+        assert charge.tolist() == [1, 0, 12, 8, 73, 72, 10, 92, 48]
+        assert mass.tolist() == [1, 1, 28, 16, 180, 180, 10, 235, 115]
+        assert isomer.tolist() == self.isomers + [False, False, True]
+
+        charge, mass, isomer = Isotope.ppn_names_to_numbers(
+            np.array([[b"NEUT ", b"C  12"]], dtype="S5")
+        )
+        assert charge.tolist() == [[0, 6]] and mass.tolist() == [[1, 12]]
+
+        with pytest.raises(ValueError):
+            Isotope.ppn_names_to_numbers(["XX 12"])
+        with pytest.raises(ValueError):
+            Isotope.ppn_names_to_numbers(["AL 2\u00e9"])
+
+        charge, mass, isomer = Isotope.ppn_names_to_numbers(
+            np.array([" AL27", "\tI*28", "C 12 "])
+        )
+        assert charge.tolist() == [13, 53, 6] and mass.tolist() == [27, 128, 12]
+
+    def test_numbers_to_ppn_names(self):
+        charge, mass = np.array(self.isotopes).T
+        names = Isotope.numbers_to_ppn_names(charge, mass, self.isomers)
+        assert names.tolist() == [name.encode() for name in self.ppn_outputs]
+
+        with pytest.raises(ValueError):
+            Isotope.numbers_to_ppn_names(73, 181, True)
+        # "AL*26" would read back as Al126.
+        with pytest.raises(ValueError):
+            Isotope.numbers_to_ppn_names(13, 26, True)
+        with pytest.raises(ValueError):
+            Isotope.numbers_to_ppn_names(48, [115, 215], True)
+
+    def test_ppn_names_round_trip(self):
+        charge, mass = np.meshgrid(np.arange(2, 119), np.arange(1, 351))
+        names = Isotope.numbers_to_ppn_names(charge, mass)
+        assert names.tolist() == [
+            [Isotope(z, a).ppn_name.encode() for z, a in zip(*row)]
+            for row in zip(charge.tolist(), mass.tolist())
+        ]
+        assert np.array_equal(
+            Isotope.ppn_names_to_numbers(names),
+            (charge, mass, np.zeros_like(names, bool)),
+        )
+
+        charge, mass = np.meshgrid(np.arange(30, 73), np.arange(100, 200))
+        names = Isotope.numbers_to_ppn_names(charge, mass, True)
+        assert np.array_equal(
+            Isotope.ppn_names_to_numbers(names),
+            (charge, mass, np.ones_like(names, bool)),
+        )
@@ -11,11 +11,16 @@ Parameters
 Return
 ------
 """
+import numpy as np
 import pytest
 
 from pathlib import Path
 
-from rates.kadonis_file import Kadonis
+from rates.isotope import Isotope
+from rates.kadonis_file import TEMPERATURES, Kadonis
+from rates.partition import PartitionFunctions
+from rates.reaclib_file import Reaclib
+from rates.temperature import Temperature
 
 kadonis_file = Path(__file__).parent / "kadonis_mock"
 
@@ -36,6 +41,16 @@ class TestKadonis:
 
         assert list(k.df.Sym) == ["H", "H", "He", "Li"]
 
+    def test_read_file_crlf(self, tmp_path):
+        path = tmp_path / "kadonis_crlf"
+        path.write_bytes(kadonis_file.read_bytes().replace(b"\n", b"\r\n"))
+        k = Kadonis(path)
+
+        assert float(k.columns["Version"]) == 1.0
+        assert np.array_equal(
+            k.columns["Rate"], Kadonis(kadonis_file).columns["Rate"], equal_nan=True
+        )
+
     def test_reaction(self):
         k = Kadonis(kadonis_file)
 
@@ -56,3 +71,199 @@ class TestKadonis:
         with pytest.raises(Exception):
             k = Kadonis(kadonis_file)
             k["Li12"]
+
+    def test_lazy_reactions(self):
+        k = Kadonis(kadonis_file)
+        assert len(k.reactions) == 0
+
+        assert str(k["Li6"]) == "n+Li6 -> Li7"
+        assert len(k.reactions) == 1
+
+        assert [str(r) for r in k] == [
+            "n+p -> d",
+            "n+d -> t",
+            "n+He3 -> He4",
+            "n+Li6 -> Li7",
+        ]
+
+    def test_rates(self):
+        k = Kadonis(kadonis_file)
+
+        assert np.array_equal(k.rates(30), k.columns["Rate"][:, 6])
+        assert np.array_equal(k.errors(30), k.columns["Error"][:, 6])
+
+        with np.errstate(divide="ignore"):
+            assert np.array_equal(
+                k.log_rates(30), np.log(k.columns["Rate"][:, 6]), equal_nan=True
+            )
+
+        temp = np.geomspace(5, 100, 20)
+        for scheme in ["linear", "cubic"]:
+            rates = k.rates(Temperature(temp, "KeV"), scheme)
+            assert rates.shape == (4, 20)
+            for row, reaction in enumerate(k):
+                assert np.allclose(rates[row], reaction.rate(temp, scheme))
+                assert np.allclose(
+                    k.log_rates(temp, scheme)[row],
+                    reaction.log_rate(temp, scheme),
+                    equal_nan=True,
+                )
+                assert np.allclose(
+                    k.errors(temp, scheme)[row], reaction.error(temp, scheme)
+                )
+
+    def test_columns(self, tmp_path):
+        lines = kadonis_file.read_text().splitlines()
+        lines[2] = lines[2].replace("2.53e+2", "-").replace("\t\tH", "\tm\tH")
+        path = tmp_path / "kadonis_missing"
+        path.write_text("\n".join(lines))
+        k = Kadonis(path)
+
+        assert k.columns["Rate"].shape == (4, 12)
+        assert k.columns["Error"].shape == (4, 12)
+        assert k.columns["Key"].tolist() == [[1, 1, 0], [1, 2, 1], [2, 3, 0], [3, 6, 0]]
+        assert np.argwhere(k.missing).tolist() == [[1, 1]]
+        assert np.isnan(k.df["RR(8keV)"][1])
+
+        assert np.shares_memory(k.reactions[1].rr, k.columns["Rate"])
+
+    def test_index(self, tmp_path):
+        lines = kadonis_file.read_text().splitlines()
+        lines.append(lines[4].replace("3\t6\t\tLi", "3\t6\tm\tLi"))
+        path = tmp_path / "kadonis_isomer"
+        path.write_text("\n".join(lines))
+        k = Kadonis(path)
+
+        assert k.index.shape == (119, 351, 2)
+        assert k.index[3, 6, 0] == 3 and k.index[3, 6, 1] == 4
+        assert k.in_file("Li6") and k.in_file(Isotope(3, 6, True))
+        assert not k.in_file("Li7") and not k.in_file(Isotope(2, 3, True))
+        assert k[Isotope(3, 6, True)] is k.reactions[4]
+        assert k[Isotope(3, 6, True)].targets[1].isomer
+        assert not k["Li6"].targets[1].isomer
+        assert k[Isotope(3, 6, True)] != k["Li6"]
+        assert k[Isotope(3, 6, True)].key != k["Li6"].key
+
+        rows, found = k.rows(["p", "Li7", Isotope(3, 6, True), "He3"])
+        assert rows.tolist() == [0, -1, 4, 2]
+        assert found.tolist() == [True, False, True, True]
+
+        rows, found = k.rows(np.array([[1, 2], [3, 6], [200, 1]]))
+        assert rows.tolist() == [1, 3, -1]
+        assert k.rows(np.array([[3, 6, 1], [3, 6, 0]]))[0].tolist() == [4, 3]
+
+    def test_keys(self):
+        k = Kadonis(kadonis_file)
+
+        assert k.keys.shape == (4, 9)
+        assert [tuple(key) for key in k.keys.tolist()] == [r.key for r in k]
+
+    def test_keys_isomer(self, tmp_path):
+        lines = kadonis_file.read_text().splitlines()
+        lines.append(lines[4].replace("3\t6\t\tLi", "3\t6\tm\tLi"))
+        path = tmp_path / "kadonis_isomer"
+        path.write_text("\n".join(lines))
+        k = Kadonis(path)
+
+        assert [tuple(key) for key in k.keys.tolist()] == [r.key for r in k]
+        # n + Li6m -> Li7, the product is the ground state.
+        assert k.keys[4, 5:].tolist() == k.keys[3, 5:].tolist()
+        assert k.keys[4].tolist() != k.keys[3].tolist()
+
+    def test_compare(self, tmp_path):
+        lines = kadonis_file.read_text().splitlines()
+        lines[3] = lines[3].replace("1.87e+3\t1.84e+2", "2.24e+3\t1.84e+2")
+        del lines[2]
+        path = tmp_path / "kadonis_changed"
+        path.write_text("\n".join(lines))
+        k = Kadonis(kadonis_file)
+        comparison = k.compare(Kadonis(path))
+
+        assert comparison.ratio.shape == (4, 12)
+        assert comparison.found.tolist() == [True, False, True, True]
+        assert comparison.other_rows.tolist() == [0, -1, 1, 2]
+        assert np.isnan(comparison.ratio[1]).all()
+        assert np.allclose(comparison.ratio[[0, 3]], 1)
+
+        column = TEMPERATURES.index(20)
+        assert comparison.ratio[2, column] == pytest.approx(1.87 / 2.24)
+        assert comparison.difference[2, column] == pytest.approx(-370)
+        assert comparison.significance[2, column] == pytest.approx(
+            -370 / np.hypot(184, 184)
+        )
+
+        largest, kt = comparison.max_deviation()
+        assert largest[2] == pytest.approx(1 - 1.87 / 2.24)
+        assert kt[2] == 20
+        assert np.isnan(largest[1]) and np.isnan(kt[1])
+        assert comparison.outliers(sigma=1).tolist() == [False, False, True, False]
+        assert not comparison.outliers(sigma=2).any()
+
+        summary = comparison.summary(sigma=1)
+        assert summary.Outlier.tolist() == [False, False, True, False]
+        assert summary.MaxDeviationKT[2] == 20
+        assert summary.MaxSignificance[2] == pytest.approx(370 / np.hypot(184, 184))
+
+    def test_compare_reaclib(self):
+        k = Kadonis(kadonis_file)
+        reaclib = Reaclib(Path(__file__).parent / "reaclib_mock")
+        comparison = k.compare(reaclib)
+
+        assert comparison.found.tolist() == [True, False, False, False]
+        temp = Temperature(np.array(TEMPERATURES, dtype=float), "KeV")
+        assert np.allclose(
+            comparison.ratio[0],
+            k.columns["Rate"][0] / reaclib.get_n_gamma("p").rate(temp.gk),
+        )
+        # Reaclib has no errors, only the Kadonis ones count.
+        assert np.allclose(
+            comparison.significance[0],
+            comparison.difference[0] / k.columns["Error"][0],
+        )
+
+    def test_to_reaclib(self):
+        k = Kadonis(kadonis_file)
+        reaclib, rows, residuals = k.to_reaclib()
+        temp = Temperature(np.array(TEMPERATURES, dtype=float), "KeV")
+
+        assert len(reaclib) == 4
+        assert rows.tolist() == [0, 1, 2, 3]
+        assert residuals.shape == (4, 12)
+        assert np.abs(residuals).max() < 0.05
+        assert np.allclose(
+            np.log(reaclib.rates(temp.gk)) - np.log(k.columns["Rate"]), residuals
+        )
+        assert set(reaclib.columns["SetLabel"]) == {"ka02"}
+        assert reaclib.get_n_gamma("Li6") == k["Li6"]
+        assert np.all(reaclib.columns["QValue"] == 0)
+
+        weighted, _, weighted_residuals = k.to_reaclib(weighted=True)
+        assert np.abs(weighted_residuals).max() < 0.05
+        assert not np.allclose(weighted.coefficients, reaclib.coefficients)
+
+        pf = PartitionFunctions(Path(__file__).parent / "winvn_mock")
+        reaclib, _, _ = k.to_reaclib(partition_functions=pf)
+        assert reaclib.columns["QValue"][0] == pytest.approx(2.224, abs=1e-3)
+
+    def test_to_reaclib_isomer(self, tmp_path):
+        lines = kadonis_file.read_text().splitlines()
+        # Li6 of the mock listed again as an isomer, with its rates doubled.
+        lines.append(
+            "\t".join(
+                field if i < 4 else "{0:.2e}".format(2 * float(field))
+                for i, field in enumerate(
+                    lines[4].replace("3\t6\t\tLi", "3\t6\tm\tLi").split("\t")
+                )
+            )
+        )
+        path = tmp_path / "kadonis_isomer"
+        path.write_text("\n".join(lines))
+        k = Kadonis(path)
+        reaclib, rows, _ = k.to_reaclib()
+
+        assert k.columns["Key"][4].tolist() == [3, 6, 1]
+        assert rows.tolist() == [0, 1, 2, 3]
+        assert len(reaclib) == 4
+        assert reaclib.get_n_gamma("Li6").rate(0.3) == pytest.approx(
+            k["Li6"].rate(Temperature(0.3).kev), rel=0.05
+        )
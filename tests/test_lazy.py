@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Tests of rates.lazy."""
+import pytest
+
+from rates.lazy import ReactionCache, ReactionFrame
+from rates.reaction import Reaction
+
+
+class Factory:
+    def __init__(self):
+        self.rows = []
+
+    def __call__(self, row):
+        self.rows.append(row)
+        return Reaction(["n"], ["p"])
+
+
+class TestReactionCache:
+    def test_builds_once(self):
+        factory = Factory()
+        reactions = ReactionCache(factory)
+
+        assert reactions[3] is reactions[3]
+        assert factory.rows == [3]
+
+    def test_bounded(self):
+        factory = Factory()
+        reactions = ReactionCache(factory, maxsize=2)
+
+        reactions[0]
+        reactions[1]
+        reactions[0]
+        reactions[2]
+
+        assert len(reactions) == 2
+        reactions[0]
+        assert factory.rows == [0, 1, 2]
+        reactions[1]
+        assert factory.rows == [0, 1, 2, 1]
+
+
+class TestReactionFrame:
+    def test_filtered_reaction(self):
+        factory = Factory()
+        df = ReactionFrame.attach({"Chapter": [1, 4, 4, 5]}, ReactionCache(factory))
+
+        selected = df[df.Chapter == 4]
+        assert isinstance(selected, ReactionFrame)
+        assert list(selected.Reaction.index) == [1, 2]
+        assert factory.rows == [1, 2]
+
+    def test_detached(self):
+        with pytest.raises(AttributeError):
+            ReactionFrame({"Chapter": [1]}).Reaction
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Tests of rates.montecarlo."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from pathlib import Path
+
+from rates.kadonis_file import Kadonis
+from rates.montecarlo import RateSampler
+from rates.reaclib_file import Reaclib
+
+reaclib_file = Path(__file__).parent / "reaclib_mock"
+kadonis_file = Path(__file__).parent / "kadonis_mock"
+
+
+def sampler(distribution="lognormal"):
+    reaclib = Reaclib.read_file(reaclib_file)
+    return RateSampler.from_kadonis(
+        reaclib, Kadonis(kadonis_file), distribution=distribution
+    )
+
+
+class TestRateSampler:
+    def test_from_kadonis(self):
+        reaclib = Reaclib.read_file(reaclib_file)
+        kadonis = Kadonis(kadonis_file)
+        rates = RateSampler.from_kadonis(reaclib, kadonis, scale=2.0)
+
+        # Only n + p -> d of the Kadonis targets is in the mock.
+        assert len(rates) == 1
+        assert list(rates.rows) == [3]
+        assert list(rates.owner) == [0]
+        assert rates.groups[0] == reaclib.group[3]
+        assert rates.width[0] == pytest.approx(2 * np.log1p(3.07e3 / 3.15e4))
+
+    def test_from_uncertainties(self):
+        table = pd.DataFrame(
+            {
+                "Charge": [1, 1, 2],
+                "Mass": [1, 2, 4],
+                "MinRate": [10.0, 1.0, 1.0],
+                "MaxRate": [40.0, 2.0, 2.0],
+                "ExperimentalUncert(%)": [5.0, np.nan, np.nan],
+            }
+        )
+        rates = RateSampler.from_uncertainties(Reaclib.read_file(reaclib_file), table)
+
+        assert list(rates.rows) == [3]
+        assert rates.width[0] == pytest.approx(np.log(2))
+        factors = rates.sample(0)
+        assert 0.5 <= factors[0] <= 2
+
+    def test_bad_distribution(self):
+        with pytest.raises(Exception):
+            sampler("normal")
+
+    def test_sample(self):
+        rates = sampler("loguniform")
+        factors = np.array([rates.sample(seed) for seed in range(1000)])
+
+        assert np.array_equal(rates.sample(1), rates.sample(1))
+        assert np.all(np.abs(np.log(factors)) <= rates.width)
+        assert np.log(factors).mean() == pytest.approx(0, abs=0.01)
+
+    def test_write(self, tmp_path):
+        reaclib = Reaclib.read_file(reaclib_file)
+        rates = sampler()
+        rates.write(tmp_path / "reaclib", np.array([2.0]))
+        written = Reaclib.read_file(tmp_path / "reaclib")
+
+        assert written.get_n_gamma("p").rate(1.0) == pytest.approx(
+            2 * reaclib.get_n_gamma("p").rate(1.0), rel=1e-5
+        )
+        assert np.array_equal(
+            np.delete(written.coefficients, 3, 0), np.delete(reaclib.coefficients, 3, 0)
+        )
+
+    def test_write_many(self, tmp_path):
+        rates = sampler()
+        factors = rates.write_many(tmp_path / "serial", 5, seed=7, processes=1)
+        braces = rates.write_many(tmp_path / "{0}", 2, seed=7, processes=1)
+        parallel = rates.write_many(tmp_path / "parallel", 5, seed=7, processes=2)
+
+        assert factors.shape == (5, 1)
+        assert np.array_equal(factors, parallel)
+        assert len(np.unique(factors)) == 5
+        assert np.array_equal(braces, factors[:2])
+        assert (tmp_path / "{0}" / "reaclib_00001").is_file()
+        for i in range(5):
+            name = "reaclib_{0:05d}".format(i)
+            assert (tmp_path / "serial" / name).read_bytes() == (
+                tmp_path / "parallel" / name
+            ).read_bytes()
+            written = Reaclib.read_file(tmp_path / "serial" / name)
+            assert np.exp(
+                written.coefficients[3, 0] - rates.template.a0[3]
+            ) == pytest.approx(factors[i, 0], rel=1e-5)
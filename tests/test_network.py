@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Tests of rates.network."""
+import numpy as np
+import pytest
+
+from rates.isotope import Isotope
+from rates.network import ReactionGraph
+from rates.reaclib_file import Reaclib
+from rates.reaction import Reaction
+
+sets = [
+    (4, ["n", "c12", "c13"]),
+    (4, ["n", "c13", "c14"]),
+    (1, ["c14", "n14"]),
+    (4, ["p", "n14", "o15"]),
+    (1, ["o15", "n15"]),
+    (5, ["p", "n15", "he4", "c12"]),
+    (8, ["he4", "he4", "he4", "c12"]),
+    (4, ["p", "p", "d"]),
+]
+
+
+@pytest.fixture
+def graph(reaclib_sets):
+    return ReactionGraph(reaclib_sets(sets))
+
+
+class TestReactionGraph:
+    def test_nodes(self, graph):
+        assert len(graph) == 10
+        assert set(graph.isotopes(np.arange(len(graph)))) == {
+            Isotope.name(n)
+            for n in ["n", "p", "d", "he4", "c12", "c13", "c14", "n14", "n15", "o15"]
+        }
+        assert graph.light.sum() == 4
+
+    def test_stoichiometry(self, graph):
+        (he4,) = graph.node("he4")
+        (c12,) = graph.node("c12")
+
+        assert graph.targets[he4, 6] == 3
+        assert graph.stoichiometry[he4, 6] == -3
+        assert graph.stoichiometry[c12, 6] == 1
+        assert graph.stoichiometry[c12, 0] == -1
+        assert graph.stoichiometry.shape == (len(graph), len(sets))
+
+    def test_producing_destroying(self, graph):
+        assert graph.producing("c12").tolist() == [5, 6]
+        assert graph.destroying("c12").tolist() == [0]
+        assert graph.destroying("p").tolist() == [3, 5, 7]
+        assert graph.producing("fe56").tolist() == []
+        assert graph.connecting("n15", "c12").tolist() == [5]
+
+    def test_neighbours(self, graph):
+        assert graph.successors("c12") == [Isotope.name("c13")]
+        assert set(graph.predecessors("c12")) == {
+            Isotope.name("n15"),
+            Isotope.name("he4"),
+        }
+        assert Isotope.name("n") not in graph.predecessors("c13")
+
+    def test_reachable(self, graph):
+        reached = graph.reachable("c12")
+        assert set(graph.isotopes(np.flatnonzero(reached))) == {
+            Isotope.name(n) for n in ["c12", "c13", "c14", "n14", "o15", "n15"]
+        }
+        assert reached.sum() == 6
+        assert graph.reachable("c12", max_steps=2).sum() == 3
+        assert graph.reachable(["p"]).sum() == 2
+
+    def test_path(self, graph):
+        assert graph.path("c13", "n15") == [
+            Isotope.name(n) for n in ["c13", "c14", "n14", "o15", "n15"]
+        ]
+        assert graph.path("he4", "c13") == [
+            Isotope.name(n) for n in ["he4", "c12", "c13"]
+        ]
+        assert graph.path("c13", "he4") == []
+        assert graph.path("c13", "fe56") == []
+
+    def test_subnetwork(self, graph):
+        sub = graph.subnetwork(["c12", "c13", "c14"])
+        assert isinstance(sub, Reaclib)
+        assert [str(r) for r in sub] == [
+            "n+C12 -> C13",
+            "n+C13 -> C14",
+            "He4+He4+He4 -> C12",
+            "p+p -> d",
+        ]
+        assert sub[Reaction(["n", "c12"], ["c13"])] == Reaction(["n", "c12"], ["c13"])
+
+        sub = graph.subnetwork(graph.reachable("c12", max_steps=1), include_light=False)
+        assert len(sub) == 0
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Tests of rates.nuclides."""
+import numpy as np
+import pytest
+
+from rates.isotope import Isotope
+from rates.nuclides import NuclideTable
+
+
+class TestNuclideTable:
+    def test_ids(self):
+        table = NuclideTable()
+        ids = table.ids([2, 6, 2, 13], [4, 12, 4, 26], [0, 0, 0, 1])
+
+        assert ids[0] == ids[2] and len(np.unique(ids)) == 3
+        assert len(table) == 3
+        assert table.ids(6, 12) == ids[1]
+        assert len(table) == 3
+        assert table.find([6, 8], [12, 16]).tolist() == [ids[1], -1]
+
+        assert table.charge_number[ids].tolist() == [2, 6, 2, 13]
+        assert table.isomer[ids].tolist() == [False, False, False, True]
+        assert table.stable[ids].tolist() == [True, True, True, False]
+        assert table.name[ids].tolist() == ["He4", "C12", "He4", "Al26"]
+
+    def test_outside_chart(self):
+        with pytest.raises(ValueError):
+            NuclideTable().ids(119, 300)
+
+    def test_isotopes(self):
+        table = NuclideTable()
+        ids = table.isotope_ids(["p", Isotope(13, 26, True), "fe56"])
+
+        assert table.id("Fe56") == ids[2]
+        assert table.isotopes(np.append(ids, -1)) == [
+            Isotope(1, 1),
+            Isotope(13, 26, True),
+            Isotope(26, 56),
+            None,
+        ]
+
+    def test_reaclib_names(self):
+        table = NuclideTable()
+        ids = table.reaclib_ids(np.array([["n", "he4", ""], ["al26", "n", ""]]))
+
+        assert ids.shape == (2, 3)
+        assert ids[0, 0] == ids[1, 1] and ids[0, 2] == -1
+        assert len(table) == 3
+        assert table.reaclib_names(ids).tolist() == [
+            ["n", "he4", ""],
+            ["al26", "n", ""],
+        ]
+
+    def test_ppn_names(self):
+        table = NuclideTable()
+        ids = table.ppn_ids(["NEUT ", "AL 27", "CD*15", "TAg80"])
+
+        assert table.isotopes(ids) == [
+            Isotope(0, 1),
+            Isotope(13, 27),
+            Isotope(48, 115, True),
+            Isotope(73, 180, True),
+        ]
+        assert table.ppn_names(ids).tolist() == [b"NEUT ", b"AL 27", b"CD*15", b"TAg80"]
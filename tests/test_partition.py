@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Tests of rates.partition."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from rates.nuclides import nuclide_table
+from rates.partition import WINVN_TEMPERATURES, PartitionFunctions, read_winvn
+
+winvn_file = Path(__file__).parent / "winvn_mock"
+
+
+class TestPartitionFunctions:
+    partition = PartitionFunctions(winvn_file)
+
+    def test_read_winvn(self):
+        columns = read_winvn(winvn_file)
+
+        assert columns["Name"].tolist()[:3] == ["n", "p", "d"]
+        assert columns["Z"].tolist()[-2:] == [13, 13]
+        assert columns["A"].tolist()[-2:] == [26, 26]
+        assert columns["Spin"][7] == 1.5
+        assert columns["MassExcess"][0] == 8.071
+        assert columns["G"].shape == (10, 24)
+
+    def test_bad_grid(self, tmp_path):
+        with open(winvn_file) as winvn:
+            lines = winvn.read().splitlines()
+        with open(tmp_path / "winvn", "w") as winvn:
+            winvn.write("\n".join([lines[0] + " 200.0"] + lines[1:]))
+        with pytest.raises(Exception):
+            read_winvn(tmp_path / "winvn")
+
+    def test_nuclides(self):
+        assert len(self.partition) == 10
+        li7, al26 = nuclide_table.id("li7"), nuclide_table.id("al26")
+
+        assert self.partition.known[[li7, al26]].all()
+        assert self.partition.spin[al26] == 5.0
+        assert self.partition.mass_excess[li7] == 14.907
+        assert np.allclose(
+            self.partition.statistical_weights([li7, nuclide_table.id("d"), -1]),
+            [4, 3, np.nan],
+            equal_nan=True,
+        )
+        assert np.isnan(self.partition.statistical_weights(nuclide_table.id("fe56")))
+
+    def test_new_nuclides(self):
+        li7 = nuclide_table.id("li7")
+        # Registered after the file was loaded, past the end of its arrays.
+        new = nuclide_table.ids(100, 300)
+        ids = np.array([li7, new, -1])
+
+        assert new >= len(self.partition.known)
+        assert self.partition.is_known(ids).tolist() == [True, False, False]
+        assert np.allclose(
+            self.partition.mass_excesses(ids), [14.907, np.nan, np.nan], equal_nan=True
+        )
+        assert np.isnan(self.partition.statistical_weights(new))
+
+    def test_log_partitions(self):
+        li7, he6 = nuclide_table.id("li7"), nuclide_table.id("he6")
+        log_g = self.partition.log_partitions(WINVN_TEMPERATURES)
+
+        assert log_g.shape == (len(nuclide_table), 24)
+        assert np.allclose(log_g[li7], np.log(1 + 0.1 * WINVN_TEMPERATURES))
+        assert np.allclose(log_g[nuclide_table.id("p")], 0)
+
+        log_g = self.partition.log_partitions(np.array([0.01, 2.0, 2.2, 20.0]))
+        assert np.allclose(log_g[li7, [0, 1, 3]], np.log([1.01, 1.2, 2.0]))
+        assert np.log(1.2) < log_g[li7, 2] < np.log(1.25)
+        assert self.partition.log_partitions(1.0)[he6] == pytest.approx(np.log(1.05))
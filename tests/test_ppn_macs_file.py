@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""Tests of rates.ppn_macs_file."""
+import numpy as np
+import pytest
+
+from pathlib import Path
+
+from rates.kadonis_file import Kadonis
+from rates.nuclides import nuclide_table
+from rates.ppn_macs_file import (
+    MACS_TEMPERATURES,
+    PPNMacs,
+    macs_to_rates,
+    read_ppn_macs,
+)
+
+ppn_file = Path(__file__).parent / "ppn_macs_mock"
+kadonis_file = Path(__file__).parent / "kadonis_mock"
+
+
+def test_test_file_exists():
+    assert ppn_file.is_file()
+
+
+class TestPPNMacs:
+    def test_read_file(self):
+        columns = read_ppn_macs(ppn_file)
+
+        assert list(columns["Z"]) == [1, 1, 2, 3, 10, 10, 10, 48]
+        assert list(columns["A"]) == [1, 2, 4, 7, 21, 21, 21, 115]
+        assert list(columns["Sym"]) == ["H", "H", "He", "Li", "Ne", "Ne", "Ne", "Cd"]
+        assert columns["MACS"].shape == (8, len(MACS_TEMPERATURES))
+        assert columns["MACS"][0, 0] == 0.87
+        assert columns["MACS"][4, 0] == 1.44
+        assert np.isnan(columns["MACS"][6, 0])
+        assert columns["MACS"][7, 5] == 601
+        assert columns["Comment"][1] == "(/41)"
+        assert columns["Notes"][1].startswith("(/1)")
+
+    def test_bad_grid(self, tmp_path):
+        lines = ppn_file.read_text().splitlines()
+        bad = tmp_path / "bad_macs"
+        bad.write_text("\n".join(["\t8" + lines[0]] + lines[1:]))
+        with pytest.raises(Exception):
+            read_ppn_macs(bad)
+
+    def test_index(self):
+        ppn = PPNMacs(ppn_file)
+        rows, found = ppn.rows(["p", "ne21", "fe56"])
+
+        assert list(rows) == [0, 4, -1]
+        assert list(found) == [True, True, False]
+        assert list(ppn.rows(nuclide_table.isotope_ids(["Cd115"]))[0]) == [7]
+        assert ppn.in_file("Li7")
+        assert not ppn.in_file("Li6")
+
+    def test_rates(self):
+        ppn = PPNMacs(ppn_file)
+        rates = ppn.rates()
+
+        # n + p at 30 keV, as in Kadonis 0.3.
+        assert rates[0, 5] == pytest.approx(5.20e4, rel=1e-3)
+        assert np.allclose(
+            rates,
+            macs_to_rates(ppn.macs, MACS_TEMPERATURES, ppn.columns["A"]),
+            equal_nan=True,
+        )
+        # v_T goes as sqrt(kT).
+        assert rates[3, 3] / rates[3, 0] == pytest.approx(
+            ppn.macs[3, 3] / ppn.macs[3, 0] * 2
+        )
+
+    def test_getitem(self):
+        ppn = PPNMacs(ppn_file)
+
+        assert str(ppn["Li7"]) == "n+Li7 -> Li8"
+        assert ppn["Li7"].rate(30) == pytest.approx(ppn.rates()[3, 5])
+        with pytest.raises(Exception):
+            ppn["Li6"]
+
+    def test_compare(self):
+        ppn = PPNMacs(ppn_file)
+        kadonis = Kadonis(kadonis_file)
+        rows, kadonis_rows, ratio = ppn.compare(kadonis)
+
+        assert list(rows) == [0, 1]
+        assert list(kadonis_rows) == [0, 1]
+        assert ratio.shape == (2, len(MACS_TEMPERATURES))
+        assert ratio[0, 0] == pytest.approx(ppn.rates()[0, 0] / 4.04e4)
+        # 10 keV is the third Kadonis column.
+        assert ratio[1, 1] == pytest.approx(ppn.rates()[1, 1] / 2.66e2)
+
+    def test_write(self, tmp_path):
+        ppn = PPNMacs(ppn_file)
+        ppn.write(tmp_path / "macs")
+        written = read_ppn_macs(tmp_path / "macs")
+
+        for key, column in read_ppn_macs(ppn_file).items():
+            assert np.array_equal(column, written[key], equal_nan=key == "MACS")
+        assert "1\t1\tH\t8.700e-1\t" in (tmp_path / "macs").read_text()
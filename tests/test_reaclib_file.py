@@ -13,11 +13,23 @@ Return
 """
 
 import pytest
+import numpy as np
 
 from pathlib import Path
 
-from rates.reaction import Reaction
-from rates.reaclib_file import Reaclib
+from rates.kadonis_file import Kadonis
+from rates.reaction import Reaction, SummedReaclibReaction, join_reaction_keys
+from rates.nuclides import nuclide_table
+from rates.partition import PartitionFunctions
+from rates.reaclib_file import (
+    Reaclib,
+    ReaclibTemplate,
+    _exponential,
+    fit_coefficients,
+    format_reaclib,
+    parse_reaclib,
+)
+from rates.temperature import t9_basis
 
 reaclib_mock_file = {
     "Chapter": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
@@ -87,6 +99,7 @@ reaclib_mock_file = {
 }
 
 reaclib_path = Path(__file__).parent
+RATE_COLUMNS = ["a{0}".format(i) for i in range(7)]
 
 
 class TestReaclib:
@@ -96,8 +109,11 @@ class TestReaclib:
         assert isinstance(reaclib, Reaclib)
 
         for column, data in reaclib_mock_file.items():
+            if column == "Rate":
+                continue
             for i, d in enumerate(data):
                 assert reaclib.df[column].iloc[i] == d
+        assert reaclib.df[RATE_COLUMNS].to_numpy().tolist() == reaclib_mock_file["Rate"]
 
     def test_default_file(self):
         Reaclib()
@@ -110,3 +126,361 @@ class TestReaclib:
 
         with pytest.raises(Exception):
             assert self.reaclib.get_n_gamma("HE6")
+
+    def test_keys(self):
+        keys = self.reaclib.keys
+
+        assert keys.shape == (len(self.reaclib), 9)
+        assert [tuple(key) for key in keys.tolist()] == [r.key for r in self.reaclib]
+
+    def test_join_kadonis(self):
+        kadonis = Kadonis(reaclib_path / "kadonis_mock")
+        kadonis_rows, reaclib_rows = join_reaction_keys(kadonis.keys, self.reaclib.keys)
+
+        for kadonis_row, reaclib_row in zip(kadonis_rows, reaclib_rows):
+            assert kadonis.reactions[kadonis_row] == self.reaclib.reactions[reaclib_row]
+        assert [str(kadonis.reactions[row]) for row in kadonis_rows] == [
+            str(r) for r in kadonis if any(r == s for s in self.reaclib)
+        ]
+
+    def test_read_file_old(self):
+        reaclib = Reaclib.read_file_old((reaclib_path / "reaclib_mock_old"))
+
+        for column, data in reaclib_mock_file.items():
+            if column == "Rate":
+                continue
+            for i, d in enumerate(data):
+                assert reaclib.df[column].iloc[i] == d
+        assert reaclib.df[RATE_COLUMNS].to_numpy().tolist() == reaclib_mock_file["Rate"]
+
+    def test_parse_reaclib(self):
+        with open(reaclib_path / "reaclib_mock", "rb") as reaclib_file:
+            columns = parse_reaclib(reaclib_file.read())
+
+        assert columns["Rate"].shape == (11, 7)
+        assert columns["Rate"].dtype == np.float64
+        assert columns["Species"].shape == (11, 6)
+        assert list(columns["Chapter"]) == reaclib_mock_file["Chapter"]
+        assert list(columns["Species"][:, 4]) == reaclib_mock_file["E4"]
+
+    def test_edit_cached(self, tmp_path):
+        path = tmp_path / "reaclib"
+        path.write_bytes((reaclib_path / "reaclib_mock").read_bytes())
+        Reaclib.read_file(path)
+        reaclib = Reaclib.read_file(path)
+
+        assert (tmp_path / "reaclib.cache").is_file()
+        reaclib.coefficients[:, 0] += 1
+        assert np.array_equal(
+            Reaclib.read_file(path).coefficients[:, 0] + 1, reaclib.coefficients[:, 0]
+        )
+
+    def test_coefficients(self):
+        assert self.reaclib.coefficients.shape == (11, 7)
+        assert self.reaclib.coefficients.flags["C_CONTIGUOUS"]
+        assert list(self.reaclib.coefficients[1]) == reaclib_mock_file["Rate"][1]
+
+    def test_species_ids(self):
+        ids = self.reaclib.species_ids
+
+        assert ids.shape == (len(self.reaclib), 6)
+        assert (
+            nuclide_table.reaclib_names(ids[:, 4]).tolist() == reaclib_mock_file["E4"]
+        )
+        assert nuclide_table.name[ids[1, :3]].tolist() == ["d", "n", "p"]
+
+    def test_rates(self):
+        temp9 = np.logspace(-2, 1, 50)
+        rates = self.reaclib.rates(temp9)
+
+        assert rates.shape == (11, 50)
+        for rate, reaction in zip(rates, self.reaclib.df.Reaction):
+            assert np.allclose(rate, reaction.rate(temp9))
+
+        assert self.reaclib.rates(0.3).shape == (11,)
+
+    def test_rates_subset(self):
+        temp9 = np.logspace(-2, 1, 5)
+
+        assert self.reaclib.rates(temp9, chapter=[4, 5]).shape == (2, 5)
+        assert self.reaclib.rates(temp9, label="cf88").shape == (4, 5)
+        assert np.allclose(
+            self.reaclib.rates(temp9, chapter=9, label="cf88"),
+            self.reaclib.rates(temp9)[8:9],
+        )
+
+        mask = np.zeros(11, dtype=bool)
+        mask[3] = True
+        assert np.allclose(
+            self.reaclib.rates(temp9, mask=mask), self.reaclib.rates(temp9)[[3]]
+        )
+
+    def test_log_rates(self):
+        temp9 = np.logspace(-2, 1, 50)
+
+        assert np.allclose(
+            np.exp(self.reaclib.log_rates(temp9)), self.reaclib.rates(temp9)
+        )
+        assert np.allclose(
+            self.reaclib.log_rates(temp9, chapter=[4, 5]),
+            self.reaclib.log_rates(temp9)[3:5],
+        )
+        assert self.reaclib.log_rates(0.3).shape == (11,)
+        assert np.allclose(
+            np.exp(self.reaclib.summed_log_rates(temp9)),
+            self.reaclib.summed_rates(temp9),
+        )
+
+    def test_rates_and_derivatives(self):
+        temp9 = np.logspace(-2, 1, 50)
+        rates, derivatives = self.reaclib.rates_and_derivatives(temp9)
+
+        assert rates.shape == derivatives.shape == (11, 50)
+        assert np.allclose(rates, self.reaclib.rates(temp9))
+        for derivative, reaction in zip(derivatives, self.reaclib.df.Reaction):
+            assert np.allclose(derivative, reaction.rate_and_derivative(temp9)[1])
+
+        rates, derivatives = self.reaclib.rates_and_derivatives(0.3, chapter=[4, 5])
+        assert rates.shape == derivatives.shape == (2,)
+        assert np.allclose(derivatives, self.reaclib.rates_and_derivatives(0.3)[1][3:5])
+
+    def test_getitem(self):
+        reaction = self.reaclib[Reaction(["d", "d"], ["he3", "n"])]
+
+        assert reaction == Reaction(["d", "d"], ["n", "he3"])
+        assert reaction.label == "de04"
+
+        with pytest.raises(Exception, match="n -> d Not found in file"):
+            self.reaclib[Reaction(["n"], ["d"])]
+
+    def test_getitem_sets(self, tmp_path):
+        with open(reaclib_path / "reaclib_mock") as reaclib_file:
+            lines = reaclib_file.read().splitlines()
+        with open(tmp_path / "reaclib_sets", "w") as reaclib_file:
+            reaclib_file.write("\n".join(lines + lines[12:16]))
+        reaclib = Reaclib.read_file(tmp_path / "reaclib_sets")
+
+        reaction = reaclib[Reaction(["n", "p"], ["d"])]
+        assert isinstance(reaction, SummedReaclibReaction)
+        assert list(reaction.rows) == [3, 11]
+        assert all(s == Reaction(["n", "p"], ["d"]) for s in reaction.sets)
+        assert np.allclose(reaction.rate(0.3), 2 * self.reaclib.rates(0.3)[3])
+
+        assert list(reaclib.get_n_gamma("p").rows) == [3, 11]
+
+    def test_summed_rates(self, tmp_path):
+        with open(reaclib_path / "reaclib_mock") as reaclib_file:
+            lines = reaclib_file.read().splitlines()
+        with open(tmp_path / "reaclib_sets", "w") as reaclib_file:
+            reaclib_file.write("\n".join(lines + lines[12:16] + lines[0:4]))
+        reaclib = Reaclib.read_file(tmp_path / "reaclib_sets")
+
+        assert list(reaclib.group_starts) == [0, 2, 3, 4, 6, 7, 8, 9, 10, 11, 12, 13]
+        assert list(reaclib.group_rows(0)) == [0, 12]
+        assert list(reaclib.group_rows(3)) == [3, 11]
+        assert reaclib.group[12] == 0
+
+        temp9 = np.logspace(-2, 1, 20)
+        summed = reaclib.summed_rates(temp9)
+        rates = reaclib.rates(temp9)
+        assert summed.shape == (11, 20)
+        assert np.allclose(summed[0], rates[0] + rates[12])
+        assert np.allclose(summed[3], rates[3] + rates[11])
+        assert np.allclose(summed[5], rates[5])
+
+        keys = np.array([reaclib.keys[3], np.zeros(9), reaclib.keys[0]])
+        groups, log_rates = reaclib.reaction_log_rates(keys, temp9)
+        assert list(groups) == [3, -1, 0]
+        assert log_rates.shape == (3, 20)
+        assert np.allclose(log_rates[0], np.log(summed[3]))
+        assert np.allclose(log_rates[2], np.log(summed[0]))
+        assert np.isnan(log_rates[1]).all()
+
+    def test_lazy_reactions(self):
+        reaclib = Reaclib.read_file((reaclib_path / "reaclib_mock"))
+        assert len(reaclib.reactions) == 0
+
+        reaclib.get_n_gamma("p")
+        assert len(reaclib.reactions) == 1
+
+        assert [str(r) for r in reaclib][0] == "n -> p"
+        assert len(list(reaclib)) == len(reaclib) == 11
+
+    def test_subset(self):
+        reaclib = Reaclib.read_file((reaclib_path / "reaclib_mock"))
+        sub = reaclib.subset(reaclib.columns["Chapter"] >= 9)
+
+        assert len(sub) == 3
+        assert sub.file_path == reaclib.file_path
+        assert np.array_equal(sub.keys, reaclib.keys[8:])
+        assert np.allclose(sub.rates([1.0]), reaclib.rates([1.0])[8:])
+        assert [str(r) for r in sub] == [str(r) for r in reaclib][8:]
+        assert len(reaclib.subset([0, 0])) == 2
+
+    def test_reverse(self):
+        partition = PartitionFunctions(reaclib_path / "winvn_mock")
+        reverse = self.reaclib.reverse(partition)
+
+        # Forward sets of chapters 4, 5, 7, 8, 9, the weak set and the
+        # reverse sets are skipped.
+        assert [str(r) for r in reverse] == [
+            "d -> n+p",
+            "n+He3 -> d+d",
+            "n+n+He4+He4 -> t+Li7",
+            "He6 -> n+n+He4",
+            "p+d -> n+p+p",
+        ]
+        assert (reverse.columns["ReverseRate"] == "v").all()
+        assert np.allclose(
+            reverse.columns["QValue"], -self.reaclib.columns["QValue"][[3, 4, 6, 7, 8]]
+        )
+
+        # The cf88 reverse sets in the file come out of their forward sets.
+        for row, file_row in [(3, 2), (4, 5)]:
+            assert np.allclose(
+                reverse.coefficients[row],
+                self.reaclib.coefficients[file_row],
+                atol=1e-3,
+            )
+
+        assert (
+            len(
+                self.reaclib.reverse(
+                    partition, mask=self.reaclib.columns["Chapter"] == 8
+                )
+            )
+            == 1
+        )
+
+    def test_partition_corrections(self):
+        partition = PartitionFunctions(reaclib_path / "winvn_mock")
+        temp9 = np.array([1.0, 2.0])
+        corrections = self.reaclib.partition_corrections(temp9, partition)
+
+        assert corrections.shape == (11, 2)
+        assert np.all(corrections[~self.reaclib.is_reverse] == 0)
+        assert np.allclose(corrections[1], 0)
+        assert np.allclose(corrections[2], -np.log(1 + 0.05 * temp9))
+        assert np.allclose(corrections[9], np.log(1 + 0.1 * temp9))
+
+        assert np.allclose(
+            self.reaclib.corrected_rates(temp9, partition),
+            self.reaclib.rates(temp9) * np.exp(corrections),
+        )
+        assert self.reaclib.corrected_log_rates(0.5, partition).shape == (11,)
+
+
+def test_fit_coefficients():
+    temp9 = np.geomspace(0.05, 1.2, 12)
+    coefficients = np.array(
+        [[10.0, -0.1, 1.0, -2.0, 0.5, -0.05, 0.3], [5.0, 0.0, 0.0, 0.0, 0.0, 0, 1]]
+    )
+    rates = np.exp(coefficients @ t9_basis(temp9))
+    rates = np.vstack((rates, rates[:1], rates[:1]))
+    rates[2, 3] = np.nan
+    rates[3, :6] = 0.0
+    weights = np.ones(rates.shape)
+    weights[1, 0] = 10.0
+
+    fitted, residuals = fit_coefficients(temp9, rates, weights)
+    assert np.abs(residuals[:3][~np.isnan(residuals[:3])]).max() < 1e-8
+    assert np.allclose(np.exp(fitted[:3] @ t9_basis(temp9)), rates[[0, 1, 0]])
+    assert np.isnan(residuals[2, 3])
+    assert np.isnan(fitted[3]).all() and np.isnan(residuals[3]).all()
+
+
+class TestWrite:
+    def test_round_trip(self, tmp_path):
+        reaclib = Reaclib.read_file(reaclib_path / "reaclib_mock")
+        reaclib.write(tmp_path / "reaclib")
+
+        source = (reaclib_path / "reaclib_mock").read_bytes()
+        assert (tmp_path / "reaclib").read_bytes() == source.rstrip(b"\n") + b"\n"
+
+    def test_round_trip_old(self, tmp_path):
+        reaclib = Reaclib.read_file_old(reaclib_path / "reaclib_mock_old")
+        reaclib.write(tmp_path / "reaclib", old_format=True)
+
+        source = (reaclib_path / "reaclib_mock_old").read_bytes()
+        assert (tmp_path / "reaclib").read_bytes() == source
+
+    def test_modified(self, tmp_path):
+        original = Reaclib.read_file(reaclib_path / "reaclib_mock")
+        rate = original.get_n_gamma("p").rate(1.0)
+        coefficients = original.coefficients.copy()
+        coefficients[3, 0] += np.log(2)
+        coefficients[3, 6] += 0.5
+        reaclib = original.with_coefficients(coefficients)
+        reaclib.write(tmp_path / "reaclib", old_format=True)
+        written = Reaclib.read_file_old(tmp_path / "reaclib")
+
+        assert np.allclose(written.coefficients, reaclib.coefficients, atol=1e-6)
+        for name in ("Chapter", "Species", "SetLabel", "RateType", "ReverseRate"):
+            assert np.array_equal(written.columns[name], reaclib.columns[name])
+        assert original.get_n_gamma("p").rate(1.0) == rate
+        for library in (reaclib, written):
+            assert library.get_n_gamma("p").rate(1.0) == pytest.approx(
+                2 * rate, rel=1e-5
+            )
+            assert library.df.a6[3] == pytest.approx(original.df.a6[3] + 0.5)
+
+        temp9 = np.logspace(-1, 1, 5)
+        rates, derivatives = written.rates_and_derivatives(temp9)
+        new_rates, new_derivatives = reaclib.rates_and_derivatives(temp9)
+        old_rates, old_derivatives = original.rates_and_derivatives(temp9)
+        assert np.allclose(new_rates, rates, rtol=1e-5)
+        assert np.allclose(new_derivatives, derivatives, atol=1e-5)
+        assert np.allclose(new_derivatives[3], old_derivatives[3] + 0.5)
+        assert np.allclose(new_rates[3], reaclib[reaclib.reactions[3]].rate(temp9))
+
+        with pytest.raises(Exception):
+            original.with_coefficients(coefficients[:3])
+
+    def test_chunks(self):
+        columns = Reaclib.read_file(reaclib_path / "reaclib_mock").columns
+        columns = {name: column for name, column in columns.items()}
+        del columns["ChapterField"]
+        whole = b"".join(format_reaclib(columns))
+
+        assert b"".join(format_reaclib(columns, chunk_size=3)) == whole
+        assert parse_reaclib(whole)["ChapterField"].tolist() == [
+            str(c) for c in columns["Chapter"]
+        ]
+        old = b"".join(format_reaclib(columns, old_format=True, chunk_size=2))
+        assert old.count(b"\n") == 3 * 11 + 3 * 11
+
+    def test_bad_fields(self):
+        columns = dict(Reaclib.read_file(reaclib_path / "reaclib_mock").columns)
+        with pytest.raises(Exception):
+            b"".join(format_reaclib(dict(columns, SetLabel=columns["SetLabel"] + "x")))
+        with pytest.raises(Exception):
+            b"".join(format_reaclib(dict(columns, QValue=columns["QValue"] * 1e200)))
+
+    def test_template(self, tmp_path):
+        reaclib = Reaclib.read_file_old(reaclib_path / "reaclib_mock_old")
+        template = ReaclibTemplate(reaclib, old_format=True)
+        template.write(tmp_path / "same")
+        template.write(tmp_path / "changed", np.array([3, 8]), np.array([1.5, -2.0]))
+        changed = Reaclib.read_file_old(tmp_path / "changed")
+
+        assert (tmp_path / "same").read_bytes() == (
+            reaclib_path / "reaclib_mock_old"
+        ).read_bytes()
+        assert list(changed.coefficients[[3, 8], 0]) == [1.5, -2.0]
+        assert np.array_equal(
+            np.delete(changed.coefficients, [3, 8], 0),
+            np.delete(reaclib.coefficients, [3, 8], 0),
+        )
+
+
+def test_exponential():
+    rng = np.random.default_rng(1)
+    values = rng.standard_normal(10000) * 10.0 ** rng.integers(-60, 60, 10000)
+    values = np.concatenate(
+        (values, [0.0, -0.0, 1.0, 9.9999995, 9.99999949, 0.5, 1.25e-7, -99.5])
+    )
+    for precision in (5, 6):
+        width = precision + 7
+        assert [bytes(chars).decode() for chars in _exponential(values, precision)] == [
+            "%*.*e" % (width, precision, value) for value in values
+        ]
@@ -16,8 +16,17 @@ import pytest
 import numpy as np
 import matplotlib.pyplot as plt
 
-from rates.reaction import Reaction, ReaclibReaction, KadonisReaction
+from rates.reaction import (
+    Reaction,
+    ReaclibReaction,
+    SummedReaclibReaction,
+    KadonisReaction,
+    reaction_keys,
+    join_reaction_keys,
+)
 from rates.isotope import Isotope
+from rates.nuclides import nuclide_table
+from rates.temperature import Temperature, TemperatureGrid
 
 
 reactions = [
@@ -61,6 +70,55 @@ class TestReaction:
 
         assert Reaction(["n", "p"], ["d"]) != Reaction(["p", "p"], ["d"])
 
+    def test_eq_other_type(self):
+        assert Reaction(["n", "p"], ["d"]) != "n+p -> d"
+        assert Reaction(["n", "p"], ["d"]).__eq__(None) is NotImplemented
+
+    def test_key(self):
+        reaction = Reaction(["p", "n"], ["d"])
+
+        assert reaction.key == Reaction(["n", "p"], ["d"]).key
+        assert reaction.key[0] == 4
+        assert reaction.key[3:5] == (-1, -1)
+        assert Reaction(["c12"], ["n", "p", "p", "he4"]).key[0] == 11
+        assert Reaction(["al26"], ["mg26"]) != Reaction(
+            [Isotope(13, 26, True)], ["mg26"]
+        )
+
+    def test_hash(self):
+        reactions = {
+            Reaction(["n", "p"], ["d"]),
+            Reaction(["p", "n"], ["d"]),
+            ReaclibReaction(["n", "p"], ["d"], [0] * 7, "Test"),
+            KadonisReaction("p", [1] * 12, [0] * 12),
+            Reaction(["p", "p"], ["d"]),
+        }
+        assert len(reactions) == 2
+
+    def test_reaction_keys(self):
+        parsed = [Reaction(r[0], r[1]) for r in reactions]
+        targets = np.full((len(parsed), 3), -1)
+        products = np.full((len(parsed), 3), -1)
+        for row, reaction in enumerate(parsed):
+            targets[row, : len(reaction.targets)] = [
+                nuclide_table.id(t) for t in reaction.targets
+            ][::-1]
+            products[row, : len(reaction.products)] = [
+                nuclide_table.id(p) for p in reaction.products
+            ]
+        keys = reaction_keys(targets, products)
+
+        assert keys.shape == (len(parsed), 9)
+        assert [tuple(key) for key in keys.tolist()] == [r.key for r in parsed]
+
+    def test_join_reaction_keys(self):
+        left = np.array([[1, 0, 0], [2, 0, 0], [3, 0, 0]])
+        right = np.array([[3, 0, 0], [1, 0, 0], [4, 0, 0], [1, 0, 0]])
+        left_rows, right_rows = join_reaction_keys(left, right)
+
+        assert left_rows.tolist() == [0, 0, 2]
+        assert right_rows.tolist() == [1, 3, 0]
+
 
 class TestReaclibReaction:
     def test_init(self):
@@ -71,6 +129,48 @@ class TestReaclibReaction:
             assert reaction.label == "Test"
             assert reaction.rate(0.3) == 307.0581685280525
 
+    def test_rate_grid(self):
+        reaction = ReaclibReaction(["n"], ["p"], a_rates=[1] * 7, label="Test")
+        grid = TemperatureGrid.logspace(-2, 1, 20)
+
+        assert np.array_equal(reaction.rate(grid), reaction.rate(grid.gk))
+        assert reaction.rate(Temperature(0.3)) == reaction.rate(0.3)
+
+    def test_log_rate(self):
+        reaction = ReaclibReaction(["n"], ["p"], a_rates=[1] * 7, label="Test")
+        temp = np.logspace(-2, 1, 20)
+        assert np.allclose(reaction.log_rate(temp), np.log(reaction.rate(temp)))
+
+        reverse = ReaclibReaction(
+            ["n"], ["p"], a_rates=[800, -0.1, 0, 0, 0, 0, 1.5], label="Test"
+        )
+        with np.errstate(over="ignore"):
+            assert np.isinf(reverse.rate(10))
+        assert np.isfinite(reverse.log_rate(10))
+        assert reverse.ratio(reverse, temp) == pytest.approx(1)
+        assert reverse.log_ratio(reaction, 10) == pytest.approx(
+            reverse.log_rate(10) - reaction.log_rate(10)
+        )
+
+    def test_rate_and_derivative(self):
+        reaction = ReaclibReaction(
+            ["n"], ["p"], a_rates=[1, -0.5, 2, 0.3, -1, 0.2, 1.5], label="Test"
+        )
+        temp = np.logspace(-2, 1, 20)
+        rate, derivative = reaction.rate_and_derivative(temp)
+
+        step = 1e-6
+        numerical = (
+            np.log(reaction.rate(temp * np.exp(step)))
+            - np.log(reaction.rate(temp * np.exp(-step)))
+        ) / (2 * step)
+        assert np.allclose(rate, reaction.rate(temp))
+        assert np.allclose(derivative, numerical)
+
+        rate, derivative = reaction.rate_and_derivative(0.3)
+        assert rate == pytest.approx(reaction.rate(0.3))
+        assert np.shape(derivative) == ()
+
     def test_reaclib_factory(self):
         assert (
             ReaclibReaction.reaclib_factory(
@@ -116,6 +216,55 @@ class TestReaclibReaction:
         plt.clf()
 
 
+class TestSummedReaclibReaction:
+    sets = [
+        ReaclibReaction(["n", "p"], ["d"], a_rates=[1] * 7, label="Test"),
+        ReaclibReaction(["p", "n"], ["d"], a_rates=[2] + [1] * 6, label="Test"),
+        ReaclibReaction(["n", "p"], ["d"], a_rates=[0.5] * 7, label="Other"),
+    ]
+
+    def test_init(self):
+        reaction = SummedReaclibReaction(self.sets)
+
+        assert str(reaction) == "n+p -> d"
+        assert reaction.label == "Test+Other"
+        assert reaction.a.shape == (3, 7)
+
+    def test_rate(self):
+        reaction = SummedReaclibReaction(self.sets)
+        temp = np.logspace(-2, 1, 10)
+
+        assert np.allclose(reaction.rate(temp), sum(s.rate(temp) for s in self.sets))
+        assert np.isclose(reaction.rate(0.3), sum(s.rate(0.3) for s in self.sets))
+
+    def test_rate_and_derivative(self):
+        reaction = SummedReaclibReaction(self.sets)
+        temp = np.logspace(-2, 1, 10)
+        rate, derivative = reaction.rate_and_derivative(temp)
+
+        set_rates = [s.rate_and_derivative(temp) for s in self.sets]
+        assert np.allclose(rate, reaction.rate(temp))
+        assert np.allclose(
+            derivative, sum(r * d for r, d in set_rates) / sum(r for r, _ in set_rates)
+        )
+
+    def test_log_rate(self):
+        reaction = SummedReaclibReaction(self.sets)
+        temp = np.logspace(-2, 1, 10)
+
+        assert np.allclose(reaction.log_rate(temp), np.log(reaction.rate(temp)))
+        big = SummedReaclibReaction(
+            [ReaclibReaction(["n"], ["p"], a_rates=[800] + [0] * 6, label="Test")] * 2
+        )
+        assert big.log_rate(1.0) == pytest.approx(800 + np.log(2))
+
+    def test_different_reactions(self):
+        with pytest.raises(Exception):
+            SummedReaclibReaction(
+                [self.sets[0], ReaclibReaction(["n"], ["p"], [1] * 7, "Test")]
+            )
+
+
 class TestKadonisReaction:
     def test_init(self):
         for n, r in zip(n_captures, n_capture_reactions):
@@ -132,10 +281,44 @@ class TestKadonisReaction:
         rk = KadonisReaction("c12", [1] * 12, [1] * 12)
         assert rk.rate(temp=30) == 1
 
+    def test_kadonis_rate_temperature(self):
+        rk = KadonisReaction("c12", list(range(12)), [1] * 12)
+        assert rk.rate(Temperature(30, "KeV")) == 6
+
+    def test_kadonis_log_rate(self):
+        temp = np.array([5, 8, 10, 15, 20, 25, 30, 40, 50, 60, 80, 100])
+        rk = KadonisReaction("c12", list(temp ** 0.5), [0] * 12)
+        reaclib = ReaclibReaction(["n", "c12"], ["c13"], [1] * 7, "Test")
+
+        assert rk.log_rate(12) == pytest.approx(np.log(12) / 2)
+        assert np.allclose(rk.log_rate(temp, "cubic"), np.log(temp) / 2)
+        assert np.isnan(rk.log_rate(200))
+
+        grid = Temperature(np.array([0.1, 0.5, 1.0]))
+        assert np.allclose(
+            rk.log_ratio(reaclib, grid), rk.log_rate(grid) - reaclib.log_rate(grid)
+        )
+        assert np.allclose(rk.ratio(reaclib, grid), rk.rate(grid) / reaclib.rate(grid))
+
     def test_kadonis_error(self):
         rk = KadonisReaction("c12", [1] * 12, [1] * 12)
         assert rk.error(temp=30) == 1
 
+    def test_kadonis_interpolate(self):
+        temp = np.array([5, 8, 10, 15, 20, 25, 30, 40, 50, 60, 80, 100])
+        rk = KadonisReaction("c12", list(temp ** 0.5), list(temp ** 0.5 / 10))
+
+        assert rk.rate(12) == pytest.approx(12 ** 0.5)
+        assert rk.error(12) == pytest.approx(12 ** 0.5 / 10)
+        assert np.allclose(
+            rk.rate(np.array([6, 35, 90]), "cubic"), np.array([6, 35, 90]) ** 0.5
+        )
+        assert rk.rate(Temperature(0.4, "Gk")) == pytest.approx(
+            Temperature(0.4, "Gk").kev ** 0.5
+        )
+        assert np.isnan(rk.rate(200))
+        assert rk.rate(200, extrapolate=True) == pytest.approx(200 ** 0.5)
+
     def test_kadonis_diff(self):
         rk1 = KadonisReaction("c12", [1] * 12, [1] * 12)
         rk2 = KadonisReaction("c12", [2] * 12, [2] * 12)
@@ -14,7 +14,7 @@ Return
 import pytest
 import numpy as np
 
-from rates.temperature import Temperature
+from rates.temperature import Temperature, TemperatureGrid, t9_basis, t9_log_derivative
 
 
 class TestTemperature:
@@ -55,3 +55,68 @@ class TestTemperature:
             516.5959185859126,
             861.7339293085188,
         ]
+
+
+def test_t9_basis():
+    temp = np.logspace(-1, 1, 10)
+    basis = t9_basis(temp)
+
+    assert basis.shape == (7, 10)
+    assert np.allclose(basis[0], 1)
+    assert np.allclose(basis[1] * temp, 1)
+    assert np.allclose(basis[2] ** -3, temp)
+    assert np.allclose(basis[5], temp ** (5 / 3))
+    assert np.allclose(basis[6], np.log(temp))
+
+    assert t9_basis(0.3).shape == (7,)
+
+
+def test_t9_log_derivative():
+    a_rates = np.array([[1, 2, 3, 4, 5, 6, 7], [0, 0, 0, 0, 1, 0, 0]])
+    derivative = t9_log_derivative(a_rates)
+
+    assert derivative.shape == (2, 7)
+    assert np.allclose(derivative[0], [7, -2, -1, 4 / 3, 5, 10, 0])
+    assert np.allclose(derivative[1] @ t9_basis(2.0), 2.0)
+
+
+class TestTemperatureGrid:
+    def test_is_temperature(self):
+        grid = TemperatureGrid([0.1, 0.3, 1.0])
+
+        assert isinstance(grid, Temperature)
+        assert list(grid.gk) == [0.1, 0.3, 1.0]
+        assert np.allclose(grid.kev, Temperature(np.array([0.1, 0.3, 1.0])).kev)
+        assert len(grid) == 3
+
+    def test_kev_input(self):
+        grid = TemperatureGrid([30, 60], unit="KeV")
+
+        assert list(grid.kev) == [30, 60]
+        assert np.allclose(grid.basis, t9_basis(grid.gk))
+
+    def test_basis_computed_once(self):
+        grid = TemperatureGrid(np.logspace(-1, 1, 10))
+
+        assert grid.basis is grid.basis
+        assert t9_basis(grid) is grid.basis
+        assert np.array_equal(grid.basis, t9_basis(np.logspace(-1, 1, 10)))
+
+    def test_read_only(self):
+        grid = TemperatureGrid(np.logspace(-1, 1, 10))
+
+        with pytest.raises(ValueError):
+            grid.gk[0] = 1
+        with pytest.raises(ValueError):
+            grid.basis[0, 0] = 1
+
+    def test_logspace_cached(self):
+        assert TemperatureGrid.logspace(-2, 1, 100) is TemperatureGrid.logspace(
+            -2, 1, 100
+        )
+        assert TemperatureGrid.logspace(-2, 1, 100) is not TemperatureGrid.logspace(
+            -2, 1, 101
+        )
+        assert np.array_equal(
+            TemperatureGrid.logspace(-2, 1, 100).gk, np.logspace(-2, 1, 100)
+        )